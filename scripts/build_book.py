@@ -1,13 +1,20 @@
+import contextlib
 import io
+import signal
 import subprocess
 import sys
 import os
+import threading
 import glob
 import shutil
 import json
 import yaml
+import re
 import time
 from datetime import datetime
+
+from build_cache import place_file, same_content, sync_tree
+from build_timing import BuildTimer
 
 # Fix: Windows cp1252 can't encode emojis — force UTF-8
 if sys.stdout.encoding and sys.stdout.encoding.lower() not in ("utf-8", "utf8"):
@@ -16,14 +23,27 @@ if sys.stderr.encoding and sys.stderr.encoding.lower() not in ("utf-8", "utf8"):
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
 VERBOSE = "--verbose" in sys.argv or "-v" in sys.argv
+# --clean discards the persistent build workspaces and forces a full rebuild
+CLEAN = "--clean" in sys.argv
+# --profile runs every timed phase under cProfile (.prof files in .build_logs/)
+PROFILE = "--profile" in sys.argv
+TIMER = BuildTimer("html", os.path.join(os.getcwd(), ".build_logs"), profile=PROFILE)
+# Printed around every write into book/_build/html (read by preview_book.py)
+PUBLISH_START_MARKER = "📤 Publicando"
+PUBLISH_END_MARKER = "📤 Publicado"
+
 
+def write_command_log(cmd, stdout, stderr, label=None):
+    """Persist full build output so quiet mode never hides errors.
 
-def write_command_log(cmd, stdout, stderr):
-    """Persist full build output so quiet mode never hides errors."""
+    `label` keeps logs from concurrent language builds (`--jobs`) apart when
+    they finish within the same second.
+    """
     log_dir = os.path.join(os.getcwd(), ".build_logs")
     os.makedirs(log_dir, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    log_path = os.path.join(log_dir, f"html-{timestamp}.log")
+    suffix = f"-{label}" if label else ""
+    log_path = os.path.join(log_dir, f"html-{timestamp}{suffix}.log")
     with open(log_path, "w", encoding="utf-8", newline="\n") as f:
         f.write("$ " + " ".join(cmd) + "\n\n")
         if stdout:
@@ -59,7 +79,7 @@ def get_jupyter_book():
     return "jupyter-book"
 
 
-def run_jupyter_book_build(cmd, label, attempts=3):
+def run_jupyter_book_build(cmd, label, attempts=3, log_label=None):
     """Run a Jupyter Book build with retries for transient network-backed extensions.
 
     Kroki diagrams are rendered through a remote service during the build. In CI or
@@ -82,7 +102,9 @@ def run_jupyter_book_build(cmd, label, attempts=3):
                     encoding="utf-8",
                     errors="replace",
                 )
-                log_path = write_command_log(cmd, result.stdout, result.stderr)
+                log_path = write_command_log(
+                    cmd, result.stdout, result.stderr, label=log_label
+                )
                 if result.returncode != 0:
                     print(f"❌ Build {label} falló. Log completo: {log_path}")
                     print("Últimas líneas relevantes:")
@@ -152,6 +174,8 @@ LANG_DISPLAY_NAMES = {
 BOOK_DIR = "book"
 BUILD_ROOT = os.path.join(BOOK_DIR, "_build")
 FINAL_HTML_DIR = os.path.join(BUILD_ROOT, "html")
+# Persistent per-language Sphinx projects (sources + _build with doctrees)
+BUILD_CACHE_DIR = os.path.join(".cache", "build")
 
 
 def get_project_default_language():
@@ -201,40 +225,56 @@ def generate_languages_json(languages, output_static_dir=None):
         os.makedirs(target_dir)
 
     json_path = os.path.join(target_dir, "languages.json")
-    with open(json_path, "w", encoding="utf-8") as f:
+    # Write-then-replace: the target may be hard-linked to another copy by
+    # merge_dir_into, and writing in place would change both files.
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(lang_data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, json_path)
 
     print(f"🌍 Archivo de idiomas generado en: {json_path}")
 
 
-def fix_pdf_paths(build_dir, pdf_filename):
-    """Fixes relative paths for the PDF download button in HTML files within a specific build dir."""
-    print(f"🔧 Corrigiendo rutas del botón PDF en {build_dir}...")
+# Transforms applied by postprocess_language_output, in registration order.
+# Each one takes (content, context) and returns the (possibly) new content.
+HTML_POSTPROCESSORS = []
 
-    for html_file in glob.glob(os.path.join(build_dir, "**", "*.html"), recursive=True):
-        rel_to_root = os.path.relpath(build_dir, os.path.dirname(html_file))
+# Generated at the Sphinx HTML root and moved into /<lang>/ by publish_standalone_build
+ROOT_LEVEL_FILES = ("search.html", "genindex.html", "searchindex.js")
 
-        if rel_to_root == ".":
-            correct_path = f"_static/{pdf_filename}"
-        else:
-            correct_path = f"{rel_to_root}/_static/{pdf_filename}".replace("\\", "/")
+THEBE_SCRIPT_PATTERN = re.compile(
+    r'<script>const THEBE_JS_URL = ".*?"; const thebe_selector = ".*?"; const thebe_selector_input = ".*?"; const thebe_selector_output = ".*?"</script>',
+    re.DOTALL,
+)
 
-        with open(html_file, "r", encoding="utf-8") as f:
-            content = f.read()
 
-        target_string = f"_static/{pdf_filename}"
+def html_postprocessor(func):
+    """Registers a transform in the single-pass HTML post-processing pipeline."""
+    HTML_POSTPROCESSORS.append(func)
+    return func
 
-        if target_string in content:
-            new_content = content.replace(
-                f'href="{target_string}"', f'href="{correct_path}"'
-            )
 
-            if new_content != content:
-                with open(html_file, "w", encoding="utf-8") as f:
-                    f.write(new_content)
+@html_postprocessor
+def fix_pdf_paths(content, context):
+    """Fixes relative paths for the PDF download button."""
+    if not context["filename"].endswith(".html"):
+        return content
+
+    pdf_filename = context["pdf_filename"]
+    rel_to_root = context["rel_to_root"]
+    if rel_to_root == ".":
+        correct_path = f"_static/{pdf_filename}"
+    else:
+        correct_path = f"{rel_to_root}/_static/{pdf_filename}"
+
+    target_string = f"_static/{pdf_filename}"
+    if target_string not in content:
+        return content
+    return content.replace(f'href="{target_string}"', f'href="{correct_path}"')
 
 
-def fix_html_asset_paths(html_file):
+@html_postprocessor
+def fix_html_asset_paths(content, context):
     """Fix asset paths in HTML files moved from build root to language subdirectory.
 
     Sphinx generates search.html/genindex.html at the build root where _static/
@@ -243,10 +283,8 @@ def fix_html_asset_paths(html_file):
 
     Also fixes _sources/ paths and data-content_root attribute.
     """
-    with open(html_file, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    original = content
+    if not context["moved_from_root"] or not context["filename"].endswith(".html"):
+        return content
 
     # Fix data-content_root: "./" → "../" (points from /es/ to root)
     content = content.replace('data-content_root="./"', 'data-content_root="../"')
@@ -254,8 +292,6 @@ def fix_html_asset_paths(html_file):
     # Fix all relative _static/ references: href="_static/..." → href="../_static/..."
     # and src="_static/..." → src="../_static/..."
     # Be careful not to double-fix: don't match already-correct ../_static/
-    import re
-
     content = re.sub(r'(href|src)="(_static/)', r'\1="../\2', content)
     content = re.sub(r'(href|src)="(\./_static/)', r'\1="../\2', content)
 
@@ -264,16 +300,34 @@ def fix_html_asset_paths(html_file):
 
     # Fix _downloads/ paths
     content = re.sub(r'(href|src)="(_downloads/)', r'\1="../\2', content)
+    return content
 
-    if content != original:
-        with open(html_file, "w", encoding="utf-8") as f:
-            f.write(content)
-        print(f"   🔧 Fixed asset paths in {os.path.basename(html_file)}")
-    else:
-        print(f"   ℹ️ No path fixes needed in {os.path.basename(html_file)}")
 
+@html_postprocessor
+def fix_duplicate_thebe_scripts(content, context):
+    """Remove duplicated inline Thebe config script declarations.
 
-def fix_searchindex_paths(searchindex_file, lang):
+    Some generated pages include duplicate inline script blocks declaring
+    THEBE_JS_URL / selectors twice, which triggers a browser SyntaxError.
+    Keep only the first occurrence.
+    """
+    if not context["filename"].endswith(".html"):
+        return content
+
+    matches = THEBE_SCRIPT_PATTERN.findall(content)
+    if len(matches) > 1:
+        first = matches[0]
+        content = THEBE_SCRIPT_PATTERN.sub("", content)
+        insert_after = '<script src="../_static/design-tabs.js?v=f930bc37"></script>'
+        if insert_after in content:
+            content = content.replace(insert_after, insert_after + "\n    " + first, 1)
+        else:
+            content = first + "\n" + content
+    return content
+
+
+@html_postprocessor
+def fix_searchindex_paths(content, context):
     """Fix docnames in searchindex.js to remove the language prefix.
 
     Sphinx builds the standalone project with content inside a lang/ subfolder.
@@ -283,64 +337,84 @@ def fix_searchindex_paths(searchindex_file, lang):
 
     Fix: replace all occurrences of 'es/' or 'en/' prefix in docnames with ''.
     """
-    import re as _re
-
-    with open(searchindex_file, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    original = content
+    if context["filename"] != "searchindex.js":
+        return content
 
     # Pattern: in the JSON, docnames are quoted strings like "es/01_tutorial/page"
     # We need to strip the "es/" or "en/" prefix from all of them
     # The prefix appears in docnames, filenames, and possibly objects/terms references
-    prefix = f"{lang}/"
+    prefix = f"{context['lang']}/"
 
     # Replace "es/ or 'es/ at the start of a JSON string value
     # Be careful: only replace when it's a path prefix, not mid-string
-    content = _re.sub(f'"{_re.escape(prefix)}', '"', content)
+    return re.sub(f'"{re.escape(prefix)}', '"', content)
+
+
+def postprocess_file(path, context):
+    """Runs every registered transform over one file, reading and writing it once.
+
+    Returns the names of the transforms that changed the content.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        original = f.read()
+
+    content = original
+    applied = []
+    for transform in HTML_POSTPROCESSORS:
+        new_content = transform(content, context)
+        if new_content != content:
+            applied.append(transform.__name__)
+            content = new_content
 
     if content != original:
-        with open(searchindex_file, "w", encoding="utf-8") as f:
+        with open(path, "w", encoding="utf-8") as f:
             f.write(content)
-        print(f"   🔧 Fixed searchindex.js: stripped '{prefix}' prefix from all paths")
-    else:
-        print(
-            f"   ℹ️ searchindex.js: no '{prefix}' prefix found (may already be correct)"
-        )
+    return applied
 
 
-def fix_duplicate_thebe_scripts(html_file):
-    """Remove duplicated inline Thebe config script declarations.
+def postprocess_language_output(lang_root, lang):
+    """Applies the HTML post-processing pipeline to a published language.
 
-    Some generated pages include duplicate inline script blocks declaring
-    THEBE_JS_URL / selectors twice, which triggers a browser SyntaxError.
-    Keep only the first occurrence.
+    Every generated `.html` file (plus `searchindex.js`) is opened once and
+    goes through all registered transforms; files are rewritten only when
+    something changed. Files are processed concurrently in a thread pool.
     """
-    import re
+    from concurrent.futures import ThreadPoolExecutor
 
-    with open(html_file, "r", encoding="utf-8") as f:
-        content = f.read()
+    tasks = []
+    for root, _dirs, files in os.walk(lang_root):
+        for filename in files:
+            if not (filename.endswith(".html") or filename == "searchindex.js"):
+                continue
+            path = os.path.join(root, filename)
+            moved_from_root = (
+                os.path.normpath(root) == os.path.normpath(lang_root)
+                and filename in ROOT_LEVEL_FILES
+            )
+            context = {
+                "lang": lang,
+                "filename": filename,
+                "pdf_filename": f"teachbook_{lang}.pdf",
+                "rel_to_root": os.path.relpath(lang_root, root).replace("\\", "/"),
+                "moved_from_root": moved_from_root,
+            }
+            tasks.append((path, context))
 
-    original = content
+    changed = {}
+    with ThreadPoolExecutor() as pool:
+        results = pool.map(lambda task: postprocess_file(*task), tasks)
+        for (path, _context), applied in zip(tasks, results):
+            if applied:
+                changed[path] = applied
 
-    pattern = re.compile(
-        r'<script>const THEBE_JS_URL = ".*?"; const thebe_selector = ".*?"; const thebe_selector_input = ".*?"; const thebe_selector_output = ".*?"</script>',
-        re.DOTALL,
+    for path in sorted(changed):
+        if os.path.basename(path) in ROOT_LEVEL_FILES:
+            print(f"   🔧 {os.path.basename(path)}: {', '.join(changed[path])}")
+    print(
+        f"🔧 Post-procesado HTML ({lang}): {len(tasks)} archivos revisados, "
+        f"{len(changed)} modificados"
     )
-    matches = pattern.findall(content)
-    if len(matches) > 1:
-        first = matches[0]
-        content = pattern.sub("", content)
-        insert_after = '<script src="../_static/design-tabs.js?v=f930bc37"></script>'
-        if insert_after in content:
-            content = content.replace(insert_after, insert_after + "\n    " + first, 1)
-        else:
-            content = first + "\n" + content
-
-    if content != original:
-        with open(html_file, "w", encoding="utf-8") as f:
-            f.write(content)
-        print(f"   🔧 Removed duplicated Thebe script in {os.path.basename(html_file)}")
+    return changed
 
 
 def build_language(lang):
@@ -355,8 +429,9 @@ def build_language(lang):
         final_dest = FINAL_HTML_DIR
         pdf_name = "teachbook.pdf"
 
-        # Standard build logic for default
-        if os.path.exists(build_cache_dir):
+        # Standard build logic for default. Keep the Sphinx environment
+        # between runs unless a clean build is requested.
+        if CLEAN and os.path.exists(build_cache_dir):
             shutil.rmtree(build_cache_dir)
 
         cmd = [
@@ -367,10 +442,12 @@ def build_language(lang):
             os.path.abspath(os.path.join(BOOK_DIR, config_file)),
             "--toc",
             os.path.abspath(os.path.join(BOOK_DIR, toc_file)),
-            "--all",
         ]
+        if CLEAN:
+            cmd.append("--all")
         try:
-            run_jupyter_book_build(cmd, "DEFAULT")
+            with TIMER.phase("jupyter-book", lang):
+                run_jupyter_book_build(cmd, "DEFAULT")
             print(f"✅ Versión default lista en: {final_dest}")
         except subprocess.CalledProcessError:
             print(f"❌ Error compilando idioma: {lang}")
@@ -378,167 +455,346 @@ def build_language(lang):
         return
 
     # LOCALIZED STANDALONE BUILD (en, fr, etc.)
+    try:
+        build_workspace = run_standalone_build(lang)
+        if build_workspace:
+            publish_standalone_build(lang, build_workspace)
+    except subprocess.CalledProcessError:
+        print(f"❌ Error compilando idioma standalone: {lang}")
+        sys.exit(1)
+
+
+def get_standalone_build_root(lang):
+    """Returns the persistent standalone project root used to build `lang`."""
+    # .cache/build/{lang} lives outside book/ to avoid recursion/path issues
+    return os.path.abspath(os.path.join(os.getcwd(), BUILD_CACHE_DIR, lang))
+
+
+def prepare_standalone_project(lang):
+    """Syncs the persistent standalone project for a localized build.
+
+    The project is reused between runs so Sphinx keeps its doctrees and only
+    rebuilds changed pages. Returns the project root, or None when
+    `book/<lang>` does not exist.
+    """
     config_file = f"_config_{lang}.yml"
     toc_file = f"_toc_{lang}.yml"
-    pdf_name = f"teachbook_{lang}.pdf"
 
-    # 1. Create temporary standalone project AT ROOT to avoid recursion/path issues
-    # Use _temp_build_{lang}
-    temp_build_root = os.path.abspath(os.path.join(os.getcwd(), f"_temp_build_{lang}"))
-    if os.path.exists(temp_build_root):
-        shutil.rmtree(temp_build_root)
-    os.makedirs(temp_build_root)
+    # 1. Reuse the standalone project outside book/ to avoid recursion/path issues
+    build_workspace = get_standalone_build_root(lang)
+    if CLEAN and os.path.exists(build_workspace):
+        shutil.rmtree(build_workspace)
+    os.makedirs(build_workspace, exist_ok=True)
 
-    # 2. Copy localized content AS A SUBFOLDER to keep paths valid (e.g., temp_en/en/intro.md)
+    # 2. Sync localized content AS A SUBFOLDER to keep paths valid (e.g., en/en/intro.md)
     lang_src_dir = os.path.join(BOOK_DIR, lang)
-    lang_dst_dir = os.path.join(temp_build_root, lang)
+    lang_dst_dir = os.path.join(build_workspace, lang)
     if not os.path.exists(lang_src_dir):
         print(
             f"❌ Error: No existe la carpeta de contenido para '{lang}': {lang_src_dir}"
         )
-        return
+        return None
 
-    print(f"📂 Preparando entorno standalone en: {temp_build_root}")
-    print(f"📂 Copiando contenido de '{lang}' a carpeta interna para mantener rutas...")
-    shutil.copytree(lang_src_dir, lang_dst_dir)
+    print(f"📂 Preparando entorno standalone en: {build_workspace}")
+    print(f"📂 Sincronizando contenido de '{lang}' en carpeta interna para mantener rutas...")
+    _, removed = sync_tree(lang_src_dir, lang_dst_dir)
 
-    # 3. Copy _static folder (required for logo, css, js)
+    # 3. Sync _static folder (required for logo, css, js). Nothing edits these
+    # files inside the workspace, so hard links avoid duplicating PDFs/videos.
     static_src = os.path.join(BOOK_DIR, "_static")
-    static_dst = os.path.join(temp_build_root, "_static")
+    static_dst = os.path.join(build_workspace, "_static")
     if os.path.exists(static_src):
-        shutil.copytree(static_src, static_dst)
+        removed += sync_tree(static_src, static_dst, link=True)[1]
+
+    # Sphinx never deletes output, and publishing copies _build/html whole:
+    # after a page, image or static file is removed, rewrite the output from
+    # the pickled environment so the stale files are not published again.
+    html_output = os.path.join(build_workspace, "_build", "html")
+    if removed and os.path.isdir(html_output):
+        print(f"🧹 {removed} archivo(s) eliminado(s) desde el último build: se regenera {html_output}")
+        shutil.rmtree(html_output)
 
     # 4. Copy and rename config/toc
-    dest_config = os.path.join(temp_build_root, "_config.yml")
+    dest_config = os.path.join(build_workspace, "_config.yml")
     shutil.copy2(os.path.join(BOOK_DIR, config_file), dest_config)
     shutil.copy2(
-        os.path.join(BOOK_DIR, toc_file), os.path.join(temp_build_root, "_toc.yml")
+        os.path.join(BOOK_DIR, toc_file), os.path.join(build_workspace, "_toc.yml")
     )
 
     # Sanitize config to prevent self-exclusion
     sanitize_config(dest_config)
+    return build_workspace
+
+
+def run_standalone_build(lang):
+    """Prepares and compiles the standalone project for `lang`.
 
-    # 5. Build from the temp directory (Explicit config)
+    Only touches `.cache/build/<lang>`, so several languages can run this at
+    the same time (`--jobs`). Publishing into the shared output is done
+    afterwards by `publish_standalone_build`. Raises CalledProcessError if the
+    build fails.
+    """
+    with TIMER.phase("sync", lang):
+        build_workspace = prepare_standalone_project(lang)
+    if not build_workspace:
+        return None
+
+    # 5. Build from the persistent project (Explicit config). Without --all,
+    # Sphinx reuses its pickled environment and only re-reads changed pages.
     cmd = [
         get_jupyter_book(),
         "build",
-        temp_build_root,
+        build_workspace,
         "--config",
-        dest_config,
-        "--all",
+        os.path.join(build_workspace, "_config.yml"),
         "-v",
     ]
+    if CLEAN:
+        cmd.append("--all")
+    with TIMER.phase("jupyter-book", lang):
+        run_jupyter_book_build(cmd, f"STANDALONE ({lang})", log_label=lang)
 
-    try:
-        run_jupyter_book_build(cmd, f"STANDALONE ({lang})")
-
-        # DEBUG: See what was created
-        debug_directory(temp_build_root)
+    # DEBUG: See what was created
+    debug_directory(build_workspace)
+    return build_workspace
 
-        # The output will be in temp_build_root/_build/html/en/ (since en is a subfolder)
-        built_html_path_nested = os.path.join(temp_build_root, "_build", "html", lang)
-        final_dest = os.path.join(FINAL_HTML_DIR, lang)
 
-        if not os.path.exists(built_html_path_nested):
-            built_html_path_nested = os.path.join(temp_build_root, "_build", "html")
+@contextlib.contextmanager
+def publish_phase(label):
+    """Marks a write into book/_build/html so it is never left half done.
 
-        # Fix PDF paths BEFORE moving
-        if os.path.exists(built_html_path_nested):
-            fix_pdf_paths(built_html_path_nested, pdf_name)
+    preview_book.py --cancel-stale does not cancel a build between the two
+    marker lines, and a SIGTERM that still arrives (e.g. preview shutdown)
+    is only acted on once the phase ends.
+    """
+    print(f"{PUBLISH_START_MARKER} {label}...", flush=True)
+    deferred = []
+    # Signal handlers can only be installed from the main thread.
+    defer = hasattr(signal, "SIGTERM") and threading.current_thread() is threading.main_thread()
+    if defer:
+        previous = signal.signal(signal.SIGTERM, lambda signum, frame: deferred.append(signum))
+    try:
+        yield
+    finally:
+        if defer:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL if previous is None else previous)
+        print(f"{PUBLISH_END_MARKER} {label}.", flush=True)
+    if deferred:
+        signal.raise_signal(signal.SIGTERM)
 
-        print(f"🚚 Moviendo de {built_html_path_nested} a {final_dest}")
-        if os.path.exists(final_dest):
-            shutil.rmtree(final_dest)
 
-        # Ensure parent dir exists
-        os.makedirs(os.path.dirname(final_dest), exist_ok=True)
+def publish_standalone_build(lang, build_workspace):
+    """Moves a finished standalone build into book/_build/html and fixes paths.
 
-        shutil.copytree(built_html_path_nested, final_dest)
-        print(f"✅ Versión {lang} movida correctamente.")
-
-        # Fix duplicated inline Thebe config blocks on all generated pages
-        for root, _dirs, files in os.walk(final_dest):
-            for filename in files:
-                if filename.endswith(".html"):
-                    fix_duplicate_thebe_scripts(os.path.join(root, filename))
-
-        # CRITICAL FIX: Copy search files from temp build root to language dir
-        # Sphinx generates search.html, genindex.html, and searchindex.js at the HTML root,
-        # but pages reference them with relative paths like "../search.html"
-        temp_html_root = os.path.join(temp_build_root, "_build", "html")
-        search_files = ["search.html", "genindex.html", "searchindex.js"]
-        for search_file in search_files:
-            src = os.path.join(temp_html_root, search_file)
-            if os.path.isfile(src):
-                dst = os.path.join(final_dest, search_file)
-                shutil.copy2(src, dst)
-                print(f"📋 Copied {search_file} to {final_dest}")
-
-                # CRITICAL: Fix asset paths in HTML files
-                # Sphinx generated these files at the build root where _static/ is
-                # a sibling. Now they're inside /es/ so _static/ is at ../_static/
-                if search_file.endswith(".html"):
-                    fix_html_asset_paths(dst)
-
-                # CRITICAL: Fix searchindex.js docnames (strip "es/" prefix)
-                # Without this, search results link to /es/es/page.html (double prefix → 404)
-                if search_file == "searchindex.js":
-                    fix_searchindex_paths(dst, lang)
-
-        # CRITICAL FIX: Merge the generated _static folder (containing theme assets)
-        # from the temp build to the final root _static folder.
-        temp_static_dir = os.path.join(temp_build_root, "_build", "html", "_static")
-        final_static_dir = os.path.join(FINAL_HTML_DIR, "_static")
-
-        if os.path.exists(temp_static_dir):
-            print(
-                f"📦 Merging theme assets from temp build ({lang}) to global _static..."
-            )
+    Writes to the shared `_static`/`_images` folders, so callers must never run
+    this for two languages at the same time.
+    """
+    with publish_phase(lang):
+        with TIMER.phase("publish-copy", lang):
+            final_dest = copy_language_output(lang, build_workspace)
+
+        # One pass over every published page: PDF button paths, asset paths of the
+        # moved search pages (_static/ is now at ../_static/), duplicated Thebe
+        # config blocks and searchindex.js docnames (strip the "es/" prefix).
+        with TIMER.phase("html-postprocess", lang):
+            postprocess_language_output(final_dest, lang)
+
+        with TIMER.phase("static-merge", lang):
+            merge_language_assets(lang, build_workspace)
+
+
+def copy_language_output(lang, build_workspace):
+    """Copies the built pages of `lang` (plus root search files) to book/_build/html/<lang>."""
+    # The output will be in .cache/build/en/_build/html/en/ (since en is a subfolder)
+    built_html_path_nested = os.path.join(build_workspace, "_build", "html", lang)
+    final_dest = os.path.join(FINAL_HTML_DIR, lang)
+
+    if not os.path.exists(built_html_path_nested):
+        built_html_path_nested = os.path.join(build_workspace, "_build", "html")
+
+    print(f"🚚 Moviendo de {built_html_path_nested} a {final_dest}")
+    if os.path.exists(final_dest):
+        shutil.rmtree(final_dest)
+
+    # Ensure parent dir exists
+    os.makedirs(os.path.dirname(final_dest), exist_ok=True)
+
+    shutil.copytree(built_html_path_nested, final_dest)
+    print(f"✅ Versión {lang} movida correctamente.")
+
+    # CRITICAL FIX: Copy search files from temp build root to language dir
+    # Sphinx generates search.html, genindex.html, and searchindex.js at the HTML root,
+    # but pages reference them with relative paths like "../search.html"
+    temp_html_root = os.path.join(build_workspace, "_build", "html")
+    for search_file in ROOT_LEVEL_FILES:
+        src = os.path.join(temp_html_root, search_file)
+        if os.path.isfile(src):
+            dst = os.path.join(final_dest, search_file)
+            shutil.copy2(src, dst)
+            print(f"📋 Copied {search_file} to {final_dest}")
+    return final_dest
+
+
+def merge_language_assets(lang, build_workspace):
+    """Merges the `_static` and `_images` of a language build into the shared root."""
+    # CRITICAL FIX: Merge the generated _static folder (containing theme assets)
+    # from the temp build to the final root _static folder.
+    temp_static_dir = os.path.join(build_workspace, "_build", "html", "_static")
+    final_static_dir = os.path.join(FINAL_HTML_DIR, "_static")
+
+    if os.path.exists(temp_static_dir):
+        print(
+            f"📦 Merging theme assets from temp build ({lang}) to global _static..."
+        )
 
-            # DEBUG: List source files to verify we actually have something to copy
-            print(f"   🔍 Source _static content ({temp_static_dir}):")
-            try:
-                for item in os.listdir(temp_static_dir):
-                    print(f"      - {item}")
-            except Exception as e:
-                print(f"      ⚠️ Error listing source: {e}")
+        # DEBUG: List source files to verify we actually have something to copy
+        print(f"   🔍 Source _static content ({temp_static_dir}):")
+        try:
+            for item in os.listdir(temp_static_dir):
+                print(f"      - {item}")
+        except Exception as e:
+            print(f"      ⚠️ Error listing source: {e}")
 
-            if not os.path.exists(final_static_dir):
-                os.makedirs(final_static_dir)
+        if not os.path.exists(final_static_dir):
+            os.makedirs(final_static_dir)
 
-            # Use the robust merge_dir_into (now global)
-            merge_dir_into(temp_static_dir, final_static_dir)
+        # Use the robust merge_dir_into (now global). These are build outputs
+        # of our own workspace, so every language can share them by hard link.
+        merge_dir_into(temp_static_dir, final_static_dir, link=True)
 
-            # DEBUG: Verify copy
-            print(
-                f"   ✅ Merge complete. Final _static count: {len(os.listdir(final_static_dir))}"
-            )
-
-        # CRITICAL FIX: Sphinx stores document images in a root-level _images/
-        # directory, while localized pages live under /es/ and /en/ and link to
-        # ../../_images/.... A clean multi-language build must therefore merge
-        # each temp build's _images directory into the final root _images.
-        temp_images_dir = os.path.join(temp_build_root, "_build", "html", "_images")
-        final_images_dir = os.path.join(FINAL_HTML_DIR, "_images")
-        if os.path.exists(temp_images_dir):
-            print(f"🖼️  Merging document images from temp build ({lang}) to global _images...")
-            if not os.path.exists(final_images_dir):
-                os.makedirs(final_images_dir)
-            merge_dir_into(temp_images_dir, final_images_dir)
-
-    except subprocess.CalledProcessError:
-        print(f"❌ Error compilando idioma standalone: {lang}")
-        sys.exit(1)
-    finally:
-        # Cleanup temp directory
-        if os.path.exists(temp_build_root):
-            shutil.rmtree(temp_build_root)
+        # DEBUG: Verify copy
+        print(
+            f"   ✅ Merge complete. Final _static count: {len(os.listdir(final_static_dir))}"
+        )
+
+    # CRITICAL FIX: Sphinx stores document images in a root-level _images/
+    # directory, while localized pages live under /es/ and /en/ and link to
+    # ../../_images/.... A clean multi-language build must therefore merge
+    # each temp build's _images directory into the final root _images.
+    temp_images_dir = os.path.join(build_workspace, "_build", "html", "_images")
+    final_images_dir = os.path.join(FINAL_HTML_DIR, "_images")
+    if os.path.exists(temp_images_dir):
+        print(f"🖼️  Merging document images from temp build ({lang}) to global _images...")
+        if not os.path.exists(final_images_dir):
+            os.makedirs(final_images_dir)
+        merge_dir_into(temp_images_dir, final_images_dir)
+
+
+def get_jobs_option():
+    """Reads `--jobs N` from the command line.
+
+    Defaults to 1 (sequential). `--jobs 0` or `--jobs auto` uses one worker
+    per CPU core.
+    """
+    if "--jobs" not in sys.argv:
+        return 1
+    try:
+        value = sys.argv[sys.argv.index("--jobs") + 1].strip().lower()
+    except IndexError:
+        print("❌ Falta el valor de --jobs. Usa: --jobs N (o --jobs auto)")
+        sys.exit(1)
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        jobs = int(value)
+    except ValueError:
+        print(f"❌ Valor no válido para --jobs: {value}")
+        sys.exit(1)
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def get_languages_option(languages):
+    """Reads `--languages es,en` (the subset to rebuild) from the command line.
+
+    Returns every language when the option is absent. Languages that were
+    never published to book/_build/html are added, so a subset build never
+    leaves the site without one of them.
+    """
+    if "--languages" not in sys.argv or "default" in languages:
+        return languages
+    try:
+        value = sys.argv[sys.argv.index("--languages") + 1]
+    except IndexError:
+        print("❌ Falta el valor de --languages. Usa: --languages es,en")
+        sys.exit(1)
+
+    requested = [code.strip() for code in value.split(",") if code.strip()]
+    unknown = [code for code in requested if code not in languages]
+    if unknown:
+        print(f"❌ Idiomas desconocidos en --languages: {', '.join(unknown)}")
+        print(f"   Idiomas disponibles: {', '.join(languages)}")
+        sys.exit(1)
+
+    missing = [
+        lang
+        for lang in languages
+        if lang not in requested and not os.path.isdir(os.path.join(FINAL_HTML_DIR, lang))
+    ]
+    if missing:
+        print(f"ℹ️  Sin salida previa, se compilan también: {', '.join(missing)}")
+    return [lang for lang in languages if lang in requested or lang in missing]
+
+
+def run_standalone_build_timed(lang):
+    """Process-pool entry point: runs the build and returns its phase timings too."""
+    TIMER.drain()
+    try:
+        build_workspace = run_standalone_build(lang)
+    except SystemExit as exc:
+        # future.result() would re-raise it in the parent and stop every language.
+        raise RuntimeError(f"el build terminó con sys.exit({exc.code})") from None
+    return build_workspace, TIMER.drain()
+
+
+def build_languages_parallel(languages, jobs):
+    """Builds several languages at once, publishing them one by one.
+
+    Each `jupyter-book build` runs in its own process against its own
+    `.cache/build/<lang>` project. The steps that write to the shared output
+    (`_static`, `_images`) run here in the parent process, in language order,
+    so the merged result is the same as a sequential build.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(jobs, len(languages))
+    print(f"⚡ Compilando {len(languages)} idiomas en paralelo ({workers} procesos)...")
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(lang, pool.submit(run_standalone_build_timed, lang)) for lang in languages]
+        for lang, future in futures:
+            try:
+                build_workspace, records = future.result()
+                TIMER.extend(records)
+            except Exception as exc:
+                # Includes OSError from sync_tree and a worker killed mid-build.
+                if not isinstance(exc, subprocess.CalledProcessError):
+                    print(f"   {type(exc).__name__}: {exc}")
+                print(f"❌ Error compilando idioma standalone: {lang}")
+                failed.append(lang)
+                continue
+            # A language that failed does not hold back the others.
+            if build_workspace:
+                publish_standalone_build(lang, build_workspace)
 
+    if failed:
+        print(f"❌ Idiomas con errores: {', '.join(failed)}")
+        sys.exit(1)
 
-def merge_dir_into(src_dir, dst_dir):
+
+def merge_dir_into(src_dir, dst_dir, link=False):
     """Merge src_dir into dst_dir without deleting dst_dir first.
-    Overwrites files that already exist. Skips locked files gracefully."""
+
+    Files whose content already matches are skipped; changed files are
+    copied. With `link=True` they become hard links to the source instead
+    (copying if linking fails), so theme assets shared by every language are
+    stored once. Only pass it for sources nothing edits in place, i.e. our
+    own build workspaces, never author files. Skips locked files gracefully.
+    """
     print(f"   🔄 Merging '{src_dir}' -> '{dst_dir}'")
+    counts = {"link": 0, "copy": 0, "same": 0}
     for root, dirs, files in os.walk(src_dir):
         rel_path = os.path.relpath(root, src_dir)
         target_dir = os.path.join(dst_dir, rel_path)
@@ -548,11 +804,20 @@ def merge_dir_into(src_dir, dst_dir):
             src_file = os.path.join(root, file)
             dst_file = os.path.join(target_dir, file)
             try:
-                shutil.copy2(src_file, dst_file)
+                if os.path.isfile(dst_file) and same_content(src_file, dst_file):
+                    # A hard link left by an older build is replaced by a copy.
+                    if link or not os.path.samefile(src_file, dst_file):
+                        counts["same"] += 1
+                        continue
+                counts[place_file(src_file, dst_file, link=link)] += 1
             except PermissionError:
                 print(f"      ⚠️  Skipped locked file: {dst_file}")
             except Exception as e:
                 print(f"      ⚠️  Copy error: {e}")
+    print(
+        f"      {counts['link']} enlazados, {counts['copy']} copiados, "
+        f"{counts['same']} sin cambios"
+    )
 
 
 def debug_directory(path):
@@ -610,6 +875,18 @@ def sanitize_config(config_path):
         print(f"⚠️ Error saneando configuración: {e}")
 
 
+def copy_languages_json_to_language(lang, final_static):
+    """Copies the root languages.json into book/_build/html/<lang>/_static, if present."""
+    if lang == "default":
+        return
+    lang_static = os.path.join(FINAL_HTML_DIR, lang, "_static")
+    if os.path.exists(lang_static):
+        lang_json_src = os.path.join(final_static, "languages.json")
+        lang_json_dst = os.path.join(lang_static, "languages.json")
+        shutil.copy2(lang_json_src, lang_json_dst)
+        print(f"📋 Copied languages.json to {lang_static}")
+
+
 def create_redirect_index(default_lang="es"):
     """Creates a root index.html that redirects to the default language."""
     redirect_html = f"""
@@ -630,6 +907,14 @@ def create_redirect_index(default_lang="es"):
 
 
 def main():
+    try:
+        build_site()
+    finally:
+        TIMER.write_report()
+
+
+def build_site():
+    """Builds every language and assembles the final multi-language site."""
     print("📚 Iniciando proceso de construcción multi-idioma...")
     languages = get_languages()
     print(f"🔍 Idiomas detectados: {languages}")
@@ -643,13 +928,33 @@ def main():
 
     generate_languages_json(languages)
 
-    for lang in languages:
-        build_language(lang)
+    # Only the selected languages are rebuilt; the others keep their published
+    # book/_build/html/<lang> (and the shared assets are merged, never wiped).
+    selected = get_languages_option(languages)
+    if selected != languages:
+        print(f"🎯 Recompilando solo: {selected}")
+
+    jobs = get_jobs_option()
+    if jobs > 1 and len(selected) > 1 and "default" not in selected:
+        build_languages_parallel(selected, jobs)
+    else:
+        for lang in selected:
+            build_language(lang)
+
+    with publish_phase("recursos compartidos"):
+        publish_shared_output(languages, final_static)
+
+    print("\n✅ ¡Construcción completa!")
+    print(f"🌍 Web disponible en: {os.path.abspath(FINAL_HTML_DIR)}")
 
+
+def publish_shared_output(languages, final_static):
+    """Writes the site-wide files once every language has been published."""
     # 1. Merge our custom static files into the root _static
     custom_static = os.path.join(BOOK_DIR, "_static")
     if os.path.exists(custom_static):
-        merge_dir_into(custom_static, final_static)
+        with TIMER.phase("custom-static-merge"):
+            merge_dir_into(custom_static, final_static)
         print(f"📦 Custom static assets merged into: {final_static}")
 
     # 2. Regenerate languages.json in ALL _static directories (Just in case)
@@ -659,14 +964,7 @@ def main():
     # Each standalone build has its own _static/ and the JS resolves relative to URL_ROOT
     # which points to the per-language root (e.g., /es/), not the site root.
     for lang in languages:
-        if lang == "default":
-            continue
-        lang_static = os.path.join(FINAL_HTML_DIR, lang, "_static")
-        if os.path.exists(lang_static):
-            lang_json_src = os.path.join(final_static, "languages.json")
-            lang_json_dst = os.path.join(lang_static, "languages.json")
-            shutil.copy2(lang_json_src, lang_json_dst)
-            print(f"📋 Copied languages.json to {lang_static}")
+        copy_languages_json_to_language(lang, final_static)
 
     if "default" not in languages and len(languages) > 0:
         default_lang = get_project_default_language()
@@ -695,9 +993,6 @@ def main():
             f.write(search_redirect)
         print(f"🔍 Root search redirect created.")
 
-    print("\n✅ ¡Construcción completa!")
-    print(f"🌍 Web disponible en: {os.path.abspath(FINAL_HTML_DIR)}")
-
     # Ensure .nojekyll exists to prevent GitHub Pages from ignoring _static
     nojekyll_path = os.path.join(FINAL_HTML_DIR, ".nojekyll")
     if not os.path.exists(nojekyll_path):
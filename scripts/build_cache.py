@@ -0,0 +1,199 @@
+"""Incremental file syncing shared by build_book.py and export_pdf.py.
+
+Both scripts build each language from a standalone project outside `book/`.
+Instead of copying `book/<lang>` and the whole `book/_static` (PDFs, videos,
+generated diagrams) into a fresh directory on every run, they keep that
+project under `.cache/` and sync it with `sync_tree`:
+
+- A manifest next to the synced folder records size, mtime and SHA-256 of
+  every source file, so unchanged files are skipped after a single `stat`.
+- Files whose bytes really changed are copied (reflinked where the OS can)
+  or hard-linked when `link=True`.
+- Files that disappeared from the source are deleted.
+
+`place_file` and `same_content` are also used by build_book.merge_dir_into to
+deduplicate identical theme assets in the final `_static`/`_images`.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    """Returns the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_path_for(dst_dir):
+    """Returns the manifest file used for `dst_dir` (a hidden sibling file)."""
+    dst_dir = os.path.normpath(dst_dir)
+    parent, name = os.path.split(dst_dir)
+    return os.path.join(parent, f".{name}.sync.json")
+
+
+def load_manifest(manifest_path):
+    """Loads a sync manifest, returning an empty one if missing or outdated."""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_manifest(manifest_path, files):
+    """Writes a sync manifest atomically."""
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": files}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def clone_file(src, dst):
+    """Copies src to dst, letting the kernel share extents when it can.
+
+    `os.copy_file_range` performs a reflink/server-side copy on filesystems
+    that support it (btrfs, XFS, NFS 4.2...). Anywhere else, or on other
+    operating systems, fall back to a regular `shutil.copy2`.
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def place_file(src, dst, link=False):
+    """Puts src at dst by hard link (if requested) or copy.
+
+    dst is always unlinked first: writing through an old hard link would
+    otherwise modify the source file too. Returns "link" or "copy".
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if link:
+        try:
+            os.link(src, dst)
+            return "link"
+        except OSError:
+            # Different volume, FAT/exFAT, or no permission: copy instead.
+            pass
+    clone_file(src, dst)
+    return "copy"
+
+
+def same_content(path_a, path_b):
+    """Returns True when both files hold identical bytes.
+
+    Cheap checks first: the same inode (an earlier hard link) or different
+    sizes answer without reading; otherwise compare SHA-256 digests.
+    """
+    try:
+        if os.path.samefile(path_a, path_b):
+            return True
+        if os.path.getsize(path_a) != os.path.getsize(path_b):
+            return False
+    except OSError:
+        return False
+    return file_sha256(path_a) == file_sha256(path_b)
+
+
+def sync_tree(src_dir, dst_dir, link=False, manifest_path=None, keep=None):
+    """Mirror src_dir into dst_dir, transferring only files whose content changed.
+
+    Unchanged files keep their timestamps, so Sphinx only re-reads the pages
+    that actually changed. With `link=True` changed files are hard-linked
+    instead of copied; only use it for trees that nobody edits in place
+    after syncing (e.g. `_static`). `keep(rel_path)` may return True for
+    files that only exist in dst_dir and must survive the sync (LaTeX
+    .aux/.toc left by the previous compile). Returns (transferred, removed).
+    """
+    manifest_path = manifest_path or manifest_path_for(dst_dir)
+    old_files = load_manifest(manifest_path)
+    new_files = {}
+    transferred = 0
+    removed = 0
+
+    for root, _dirs, files in os.walk(src_dir):
+        rel_root = os.path.relpath(root, src_dir)
+        target_root = os.path.normpath(os.path.join(dst_dir, rel_root))
+        os.makedirs(target_root, exist_ok=True)
+        for filename in files:
+            src_file = os.path.join(root, filename)
+            dst_file = os.path.join(target_root, filename)
+            rel = os.path.normpath(os.path.join(rel_root, filename)).replace(os.sep, "/")
+            src_stat = os.stat(src_file)
+            entry = old_files.get(rel)
+            dst_exists = os.path.isfile(dst_file)
+
+            if (
+                entry
+                and dst_exists
+                and entry["size"] == src_stat.st_size
+                and entry["mtime_ns"] == src_stat.st_mtime_ns
+            ):
+                new_files[rel] = entry
+                continue
+
+            digest = file_sha256(src_file)
+            if entry and dst_exists and entry["sha256"] == digest:
+                # Touched (e.g. git checkout) but identical bytes: keep dst as is.
+                pass
+            else:
+                place_file(src_file, dst_file, link=link)
+                transferred += 1
+            new_files[rel] = {
+                "size": src_stat.st_size,
+                "mtime_ns": src_stat.st_mtime_ns,
+                "sha256": digest,
+            }
+
+    expected = {
+        os.path.normcase(os.path.normpath(os.path.join(dst_dir, rel)))
+        for rel in new_files
+    }
+    for root, _dirs, files in os.walk(dst_dir, topdown=False):
+        for filename in files:
+            dst_file = os.path.join(root, filename)
+            if keep is not None and keep(os.path.relpath(dst_file, dst_dir).replace(os.sep, "/")):
+                continue
+            if os.path.normcase(os.path.normpath(dst_file)) not in expected:
+                os.remove(dst_file)
+                removed += 1
+        src_root = os.path.join(src_dir, os.path.relpath(root, dst_dir))
+        if (
+            os.path.normpath(root) != os.path.normpath(dst_dir)
+            and not os.listdir(root)
+            and not os.path.isdir(src_root)
+        ):
+            os.rmdir(root)
+
+    save_manifest(manifest_path, new_files)
+    mode = "enlazados" if link else "copiados"
+    print(
+        f"   🔄 Sincronizado '{src_dir}' -> '{dst_dir}' "
+        f"({transferred} {mode}, {removed} eliminados)"
+    )
+    return transferred, removed
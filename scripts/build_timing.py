@@ -0,0 +1,131 @@
+"""Phase timing (and optional cProfile) for build_book.py and export_pdf.py.
+
+Usage::
+
+    TIMER = BuildTimer("html", log_dir, profile="--profile" in sys.argv)
+
+    with TIMER.phase("jupyter-book", lang="es"):
+        ...
+
+    TIMER.write_report()
+
+`write_report` stores `<pipeline>-timings-<timestamp>.json` and `.csv` in the
+log directory (normally `.build_logs/`) and prints a short summary. With
+`profile=True` every phase also runs under cProfile and its stats are saved
+as `<pipeline>-profile-<timestamp>-<lang>-<phase>.prof`, ready for
+`python -m pstats` or snakeviz.
+"""
+
+import cProfile
+import csv
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class BuildTimer:
+    """Collects wall-clock durations of named build phases."""
+
+    def __init__(self, pipeline, log_dir, profile=False):
+        self.pipeline = pipeline
+        self.log_dir = log_dir
+        self.profile = profile
+        self.started = datetime.now()
+        self.started_perf = time.perf_counter()
+        self.timestamp = self.started.strftime("%Y%m%d-%H%M%S")
+        self.records = []
+
+    @contextmanager
+    def phase(self, name, lang=None):
+        """Times the enclosed block as phase `name` (optionally per language)."""
+        profiler = None
+        if self.profile:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active (nested phase): time only.
+                profiler = None
+
+        status = "ok"
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as exc:
+            status = "exit" if isinstance(exc, SystemExit) else "error"
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            record = {
+                "phase": name,
+                "lang": lang or "",
+                "seconds": round(seconds, 3),
+                "status": status,
+                "pid": os.getpid(),
+            }
+            if profiler is not None:
+                profiler.disable()
+                record["profile"] = self._dump_profile(profiler, name, lang)
+            self.records.append(record)
+
+    def drain(self):
+        """Returns and clears the collected records (used by worker processes)."""
+        records, self.records = self.records, []
+        return records
+
+    def extend(self, records):
+        """Adds records collected elsewhere, e.g. in a --jobs worker process."""
+        self.records.extend(records)
+
+    def _dump_profile(self, profiler, name, lang):
+        os.makedirs(self.log_dir, exist_ok=True)
+        parts = [self.pipeline, "profile", self.timestamp]
+        if lang:
+            parts.append(lang)
+        parts.append(name)
+        path = os.path.join(self.log_dir, "-".join(parts) + ".prof")
+        profiler.dump_stats(path)
+        return path
+
+    def write_report(self):
+        """Writes the JSON/CSV timing report and prints a per-phase summary."""
+        os.makedirs(self.log_dir, exist_ok=True)
+        total = time.perf_counter() - self.started_perf
+        base = os.path.join(self.log_dir, f"{self.pipeline}-timings-{self.timestamp}")
+
+        report = {
+            "pipeline": self.pipeline,
+            "started": self.started.isoformat(timespec="seconds"),
+            "total_seconds": round(total, 3),
+            "argv": sys.argv[1:],
+            "phases": self.records,
+        }
+        with open(base + ".json", "w", encoding="utf-8", newline="\n") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+        with open(base + ".csv", "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["phase", "lang", "seconds", "status", "pid", "profile"])
+            for record in self.records:
+                writer.writerow(
+                    [
+                        record["phase"],
+                        record["lang"],
+                        record["seconds"],
+                        record["status"],
+                        record["pid"],
+                        record.get("profile", ""),
+                    ]
+                )
+
+        print(f"\n⏱️  Tiempos por fase ({self.pipeline}, total {total:.1f}s):")
+        for record in self.records:
+            label = f"{record['phase']} [{record['lang']}]" if record["lang"] else record["phase"]
+            marker = "" if record["status"] == "ok" else f"  ({record['status']})"
+            print(f"   {label:<36} {record['seconds']:>8.2f}s{marker}")
+        print(f"   Informe: {base}.json")
+        return base + ".json"
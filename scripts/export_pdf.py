@@ -4,10 +4,18 @@ import os
 import shutil
 import sys
 import glob
+import hashlib
+import json
 import yaml
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+from build_cache import file_sha256, place_file, sync_tree
+from build_timing import BuildTimer
+import pdf_chapters
+from latex_from_html_build import KROKI_FALLBACK_TEXT, KROKI_FALLBACK_TITLE, kroki_fallback_source
+
 
 # Determine script/project directories once, before any chdir.
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -34,8 +42,48 @@ def get_jupyter_book():
 # Configuration
 BOOK_DIR = "book"
 STATIC_DIR = os.path.join(BOOK_DIR, "_static")
+# Persistent per-language LaTeX projects, synced from book/ on every run
+PDF_CACHE_DIR = os.path.join(".cache", "pdf")
+# Converted SVG figures, keyed by SVG content hash + converter versions
+PDF_FIGURE_CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache", "pdf_figures")
+# Bump to invalidate every cached figure (e.g. after changing conversion flags)
+PDF_FIGURE_CACHE_VERSION = 1
+# Bump to invalidate every stored PDF fingerprint
+PDF_FINGERPRINT_VERSION = 2
+# _static files that never reach the PDF (so CSS-only commits skip the export)
+FINGERPRINT_IGNORED_EXTENSIONS = {".css", ".js", ".map", ".html", ".mp4", ".webm", ".mov", ".ogg"}
+# `<prefix>/_static/<file>` references in Sphinx TeX, incl. `{{<path>/x}.png}`
+LATEX_ASSET_REF_PATTERNS = {
+    asset_dir: re.compile(
+        rf"([A-Za-z0-9_./-]+/{re.escape(asset_dir)}/)([^{{}}\s\\]*)\}}?(\.[A-Za-z0-9]+)?"
+    )
+    for asset_dir in ("_static", "_images")
+}
+# Mermaid PNG sidecars written by render_diagrams.py for PDF export
+PDF_FALLBACK_PNG_DIR = os.path.join(PROJECT_ROOT, BOOK_DIR, "_static", "generated", "diagrams_pdf")
+# build_book.py's persistent HTML workspaces (used by --reuse-html-build)
+HTML_BUILD_CACHE_DIR = os.path.join(".cache", "build")
+# Persistent per-language LaTeX workspaces (--latex-workspace)
+LATEX_WORKSPACE_DIR = os.path.join(PROJECT_ROOT, ".cache", "latex")
+# Files the engines leave next to the .tex and read back on the next run
+# (kept in --latex-workspace only for the document's own jobnames)
+LATEX_INTERMEDIATE_SUFFIXES = (
+    ".aux", ".toc", ".out", ".bbl", ".blg", ".idx", ".ind", ".ilg", ".lof", ".lot",
+    ".fls", ".fdb_latexmk", ".xdv", ".log", ".pdf", ".synctex.gz",
+)
+FINAL_HTML_STATIC_DIR = os.path.join(BOOK_DIR, "_build", "html", "_static")
 SUPPORTED_ENGINES = ("tectonic", "latexmk", "auto")
 VERBOSE = "--verbose" in sys.argv or "-v" in sys.argv
+REUSE_HTML_BUILD = "--reuse-html-build" in sys.argv
+# Keep each language's LaTeX tree (and its .aux/.toc) between runs
+LATEX_WORKSPACE = "--latex-workspace" in sys.argv
+# Draft mode: compile each top-level part/chapter in parallel and stitch them
+CHAPTERS = "--chapters" in sys.argv
+# --force rebuilds PDFs even when their input fingerprint did not change
+FORCE = "--force" in sys.argv
+# --profile runs every timed phase under cProfile (.prof files in .build_logs/)
+PROFILE = "--profile" in sys.argv
+TIMER = BuildTimer("pdf", os.path.join(PROJECT_ROOT, ".build_logs"), profile=PROFILE)
 
 
 def get_languages():
@@ -194,7 +242,7 @@ def latex_env(tex_engine_path):
     """Return an environment that can find a project-local LaTeX engine."""
     env = os.environ.copy()
     env.setdefault("PYTHONUTF8", "1")
-    env.setdefault("TECTONIC_CACHE_DIR", os.path.join(PROJECT_ROOT, ".venv", "tools", "tectonic-cache"))
+    env.setdefault("TECTONIC_CACHE_DIR", default_tectonic_cache_dir())
     engine_dir = os.path.dirname(os.path.abspath(tex_engine_path))
     extra_paths = [engine_dir]
     tinytex_bin = find_project_tinytex_bin_dir()
@@ -204,12 +252,23 @@ def latex_env(tex_engine_path):
     return env
 
 
-def write_command_log(cmd, stdout, stderr):
+def default_tectonic_cache_dir():
+    """Tectonic bundle cache: setup_latex.py's one, else next to the LaTeX workspaces."""
+    project_cache = os.path.join(PROJECT_ROOT, ".venv", "tools", "tectonic-cache")
+    if LATEX_WORKSPACE and not os.path.isdir(project_cache):
+        return os.path.join(LATEX_WORKSPACE_DIR, "tectonic-cache")
+    return project_cache
+
+
+def write_command_log(cmd, stdout, stderr, label=None):
     """Persist full command output so quiet mode never hides errors."""
     log_dir = os.path.join(PROJECT_ROOT, ".build_logs")
     os.makedirs(log_dir, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     safe_name = os.path.basename(cmd[0]).replace(".", "_")
+    if label:
+        # Parallel exports may log the same engine within the same second.
+        safe_name = f"{label}-{safe_name}"
     log_path = os.path.join(log_dir, f"latex-{timestamp}-{safe_name}.log")
     with open(log_path, "w", encoding="utf-8", newline="\n") as f:
         f.write("$ " + " ".join(cmd) + "\n\n")
@@ -234,8 +293,8 @@ def print_output_tail(stdout, stderr, lines=80):
         print("\n".join(tail))
 
 
-def compile_latex_with_engine(tex_engine_path, main_tex):
-    """Compile a LaTeX file with one concrete engine path."""
+def compile_latex_with_engine(tex_engine_path, main_tex, log_label=None, cwd=None):
+    """Compile a LaTeX file with one concrete engine path (relative to `cwd`)."""
     print(f"🔧 Usando motor: {tex_engine_path}")
     env = latex_env(tex_engine_path)
 
@@ -270,18 +329,19 @@ def compile_latex_with_engine(tex_engine_path, main_tex):
         try:
             print(f"🚀 Ejecutando ({attempt}/{len(commands)}): {' '.join(cmd)}")
             if VERBOSE:
-                subprocess.run(cmd, check=True, env=env)
+                subprocess.run(cmd, check=True, env=env, cwd=cwd)
             else:
                 result = subprocess.run(
                     cmd,
                     check=False,
                     env=env,
+                    cwd=cwd,
                     capture_output=True,
                     text=True,
                     encoding="utf-8",
                     errors="replace",
                 )
-                log_path = write_command_log(cmd, result.stdout, result.stderr)
+                log_path = write_command_log(cmd, result.stdout, result.stderr, log_label)
                 if result.returncode != 0:
                     print(f"❌ El motor LaTeX falló. Log completo: {log_path}")
                     print("Últimas líneas relevantes:")
@@ -399,17 +459,22 @@ def escape_latex_metadata(value):
     )
 
 
-def prepare_svg_images_for_latex(latex_build_dir):
+def prepare_svg_images_for_latex(latex_build_dir, lang=None):
     """Convert SVG images in the LaTeX build to PDF/PNG and rewrite TeX refs.
 
     Sphinx's default converter uses ImageMagick `convert`, which fails on some
     Kroki/Mermaid SVGs (`stroke-dasharray`).  XeLaTeX also cannot infer SVG
     bounding boxes directly. Prefer vector PDF output to avoid pixelated
     diagrams; fall back to PNG only if vector conversion fails.
+
+    Conversions run in a process pool (one worker per CPU). A failing file
+    does not stop the others. Returns the {svg reference: converted reference}
+    map for rewrite_tex_references once every conversion has finished, or
+    None if any of them failed.
     """
-    svg_paths = glob.glob(os.path.join(latex_build_dir, "**", "*.svg"), recursive=True)
+    svg_paths = sorted(glob.glob(os.path.join(latex_build_dir, "**", "*.svg"), recursive=True))
     if not svg_paths:
-        return True
+        return {}
 
     resvg = shutil.which("resvg")
     if not resvg:
@@ -427,67 +492,68 @@ def prepare_svg_images_for_latex(latex_build_dir):
                 break
 
     rsvg_convert = shutil.which("rsvg-convert")
-    cairosvg = None
     if not resvg and not rsvg_convert:
         try:
-            import cairosvg as cairosvg_module
-
-            cairosvg = cairosvg_module
+            import cairosvg  # noqa: F401
         except Exception as exc:
             print("❌ Hay SVGs en el build LaTeX, pero no hay conversor SVG robusto.")
             print("   Instala resvg con scripts/setup_latex.py --yes, o usa rsvg-convert/CairoSVG.")
             print(f"   Detalle CairoSVG: {exc}")
-            return False
+            return None
+
+    # Reuse conversions from earlier runs (and from the other languages):
+    # most exports change no diagram at all.
+    converters = svg_converter_signature(resvg, rsvg_convert)
+    fallback_index = build_pdf_fallback_png_index()
+    results = {}
+    cache_keys = {}
+    tasks = []
+    for svg_path in svg_paths:
+        fallback_png = find_pdf_fallback_png_for_svg(svg_path, fallback_index, lang)
+        if fallback_png:
+            tasks.append((svg_path, fallback_png))
+            continue
+        cache_keys[svg_path] = figure_cache_key(svg_path, converters)
+        cached_output = restore_cached_figure(svg_path, cache_keys[svg_path])
+        if cached_output:
+            results[svg_path] = (cached_output, [], None)
+        else:
+            tasks.append((svg_path, None))
+
+    workers = max(1, min(len(tasks), os.cpu_count() or 1))
+    print(
+        f"🖼️  Convirtiendo {len(tasks)} SVG(s) a formato LaTeX-safe ({workers} procesos, "
+        f"{len(results)} reutilizados de caché)..."
+    )
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(convert_svg_for_latex, svg_path, fallback_png, resvg, rsvg_convert): svg_path
+                for svg_path, fallback_png in tasks
+            }
+            for future in as_completed(futures):
+                svg_path = futures[future]
+                try:
+                    results[svg_path] = future.result()
+                except Exception as exc:  # e.g. a worker process died
+                    results[svg_path] = (None, [], f"❌ No se pudo convertir {svg_path}: {exc}")
+    else:
+        for svg_path, fallback_png in tasks:
+            results[svg_path] = convert_svg_for_latex(svg_path, fallback_png, resvg, rsvg_convert)
 
-    print(f"🖼️  Convirtiendo {len(svg_paths)} SVG(s) a formato LaTeX-safe...")
     replacements = {}
+    failed = 0
     for svg_path in svg_paths:
-        pdf_path = os.path.splitext(svg_path)[0] + ".pdf"
-        png_path = os.path.splitext(svg_path)[0] + ".png"
-        output_path = pdf_path
-        pdf_fallback_png = find_pdf_fallback_png_for_svg(svg_path)
-        try:
-            if pdf_fallback_png:
-                shutil.copy2(pdf_fallback_png, png_path)
-                output_path = png_path
-            elif rsvg_convert:
-                subprocess.run(
-                    [rsvg_convert, "--format", "pdf", "--output", pdf_path, svg_path],
-                    check=True,
-                )
-            else:
-                if cairosvg is None:
-                    try:
-                        import cairosvg as cairosvg_module
-                        cairosvg = cairosvg_module
-                    except Exception:
-                        cairosvg = None
-                if cairosvg is not None:
-                    cairosvg.svg2pdf(url=svg_path, write_to=pdf_path)
-                else:
-                    convert_svg_to_pdf_with_svglib(svg_path, pdf_path)
-        except Exception as exc:
-            print(f"   ⚠️  Conversión vectorial falló para {os.path.basename(svg_path)}: {exc}")
-            print("      Usando PNG de alta resolución como fallback.")
-            output_path = png_path
-            try:
-                if pdf_fallback_png:
-                    shutil.copy2(pdf_fallback_png, png_path)
-                elif resvg:
-                    subprocess.run([resvg, "--zoom", "4", svg_path, png_path], check=True)
-                elif rsvg_convert:
-                    subprocess.run(
-                        [rsvg_convert, "--width", "2400", "--output", png_path, svg_path],
-                        check=True,
-                    )
-                else:
-                    if cairosvg is None:
-                        import cairosvg as cairosvg_module
-                        cairosvg = cairosvg_module
-                    cairosvg.svg2png(url=svg_path, write_to=png_path, output_width=2400)
-            except Exception as fallback_exc:
-                print(f"❌ No se pudo convertir {svg_path}: {fallback_exc}")
-                return False
+        output_path, messages, error = results[svg_path]
+        for message in messages:
+            print(message)
+        if error:
+            print(error)
+            failed += 1
+            continue
+        if svg_path in cache_keys:
+            store_cached_figure(output_path, cache_keys[svg_path])
         svg_rel = os.path.relpath(svg_path, latex_build_dir).replace(os.sep, "/")
         out_rel = os.path.relpath(output_path, latex_build_dir).replace(os.sep, "/")
         svg_base = os.path.basename(svg_path)
@@ -501,28 +567,199 @@ def prepare_svg_images_for_latex(latex_build_dir):
         # braced form, so cover it explicitly without rewriting unrelated SVGs.
         replacements[f"{{{svg_stem}}}.svg"] = f"{{{svg_stem}}}{out_ext}"
 
+    if failed:
+        print(f"❌ {failed} de {len(svg_paths)} SVG(s) no se pudieron convertir.")
+        return None
+    return replacements
+
+
+def rewrite_tex_references(latex_build_dir, replacements):
+    """Rewrite SVG references and collect nested asset refs, one read per .tex.
+
+    All replacement keys are compiled into one alternation regex (longest
+    keys first, so `_images/x.svg` wins over `x.svg`), which rewrites every
+    reference in a single scan. Do not blindly rewrite all .svg extensions:
+    mixed PDF/PNG fallback is possible, so only explicit entries are safe.
+    Returns the asset references mirror_shared_asset_paths_for_latex needs.
+    """
+    pattern = None
+    if replacements:
+        keys = sorted(replacements, key=len, reverse=True)
+        pattern = re.compile("|".join(re.escape(key) for key in keys))
+
+    needed_refs = {"_static": set(), "_images": set()}
     for tex_path in glob.glob(os.path.join(latex_build_dir, "*.tex")):
         with open(tex_path, "r", encoding="utf-8") as f:
             text = f.read()
-        original = text
-        for svg_name, png_name in replacements.items():
-            text = text.replace(svg_name, png_name)
-        # Do not blindly rewrite all .svg extensions: mixed PDF/PNG fallback is
-        # possible, so only explicit replacement entries are safe.
-        if text != original:
-            with open(tex_path, "w", encoding="utf-8") as f:
-                f.write(text)
-            print(f"   🔁 Referencias SVG actualizadas en {os.path.basename(tex_path)}")
+        if pattern is not None:
+            rewritten = pattern.sub(lambda match: replacements[match.group(0)], text)
+            if rewritten != text:
+                text = rewritten
+                with open(tex_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                print(f"   🔁 Referencias SVG actualizadas en {os.path.basename(tex_path)}")
+        collect_latex_asset_refs(text, latex_build_dir, needed_refs)
+    return needed_refs
+
+
+def collect_latex_asset_refs(text, latex_build_dir, needed_refs):
+    """Adds nested `<prefix>/_static/<file>` and `<prefix>/_images/<file>` refs found in TeX.
+
+    Each ref is (nested dir, path inside the asset dir, extension or None).
+    Sphinx writes images as `{{<path>/logo}.png}`, so the closing brace
+    between name and extension is skipped.
+    """
+    for asset_dir, pattern in LATEX_ASSET_REF_PATTERNS.items():
+        for match in pattern.finditer(text):
+            prefix = match.group(1).strip("./")
+            if prefix and prefix != f"{asset_dir}/" and match.group(2):
+                needed_refs[asset_dir].add(
+                    (os.path.join(latex_build_dir, prefix), match.group(2), match.group(3))
+                )
+
+
+def svg_converter_signature(resvg, rsvg_convert):
+    """Describes the converter chain (tools and versions) used for SVG figures."""
+    parts = [f"v{PDF_FIGURE_CACHE_VERSION}"]
+    for name, tool in (("rsvg-convert", rsvg_convert), ("resvg", resvg)):
+        if tool:
+            parts.append(f"{name} {command_version(tool)}")
+    if not rsvg_convert:
+        for module_name in ("cairosvg", "svglib"):
+            try:
+                module = __import__(module_name)
+                parts.append(f"{module_name} {getattr(module, '__version__', '?')}")
+            except Exception:
+                pass
+    return "|".join(parts)
+
+
+def command_version(tool):
+    """First line of `<tool> --version`, or an empty string."""
+    try:
+        result = subprocess.run([tool, "--version"], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    output = (result.stdout or result.stderr).strip()
+    return output.splitlines()[0] if output else ""
+
+
+def figure_cache_key(svg_path, converters):
+    return file_sha256(svg_path) + "-" + hashlib.sha256(converters.encode("utf-8")).hexdigest()[:16]
+
+
+def restore_cached_figure(svg_path, key):
+    """Places a cached PDF/PNG conversion next to svg_path. Returns its path or None."""
+    for ext in (".pdf", ".png"):
+        cached = os.path.join(PDF_FIGURE_CACHE_DIR, key + ext)
+        if os.path.isfile(cached):
+            output_path = os.path.splitext(svg_path)[0] + ext
+            place_file(cached, output_path, link=True)
+            return output_path
+    return None
+
+
+def store_cached_figure(output_path, key):
+    os.makedirs(PDF_FIGURE_CACHE_DIR, exist_ok=True)
+    cached = os.path.join(PDF_FIGURE_CACHE_DIR, key + os.path.splitext(output_path)[1])
+    if os.path.isfile(cached):
+        return
+    tmp_path = f"{cached}.{os.getpid()}.tmp"
+    shutil.copy2(output_path, tmp_path)
+    os.replace(tmp_path, cached)
+
+
+def convert_svg_for_latex(svg_path, pdf_fallback_png, resvg, rsvg_convert):
+    """Convert one SVG next to itself as PDF (or PNG fallback).
+
+    Runs in a worker process, so it only takes picklable arguments and
+    returns (output_path, messages, error) instead of printing; error is
+    None on success.
+    """
+    pdf_path = os.path.splitext(svg_path)[0] + ".pdf"
+    png_path = os.path.splitext(svg_path)[0] + ".png"
+    messages = []
+    try:
+        if pdf_fallback_png:
+            shutil.copy2(pdf_fallback_png, png_path)
+            return png_path, messages, None
+        if rsvg_convert:
+            subprocess.run(
+                [rsvg_convert, "--format", "pdf", "--output", pdf_path, svg_path],
+                check=True,
+            )
+        else:
+            cairosvg = import_cairosvg()
+            if cairosvg is not None:
+                cairosvg.svg2pdf(url=svg_path, write_to=pdf_path)
+            else:
+                convert_svg_to_pdf_with_svglib(svg_path, pdf_path)
+        return pdf_path, messages, None
+    except Exception as exc:
+        messages.append(f"   ⚠️  Conversión vectorial falló para {os.path.basename(svg_path)}: {exc}")
+        messages.append("      Usando PNG de alta resolución como fallback.")
+
+    try:
+        if pdf_fallback_png:
+            shutil.copy2(pdf_fallback_png, png_path)
+        elif resvg:
+            subprocess.run([resvg, "--zoom", "4", svg_path, png_path], check=True)
+        elif rsvg_convert:
+            subprocess.run(
+                [rsvg_convert, "--width", "2400", "--output", png_path, svg_path],
+                check=True,
+            )
+        else:
+            cairosvg = import_cairosvg()
+            if cairosvg is None:
+                import cairosvg
+            cairosvg.svg2png(url=svg_path, write_to=png_path, output_width=2400)
+    except Exception as fallback_exc:
+        return None, messages, f"❌ No se pudo convertir {svg_path}: {fallback_exc}"
+    return png_path, messages, None
+
+
+def import_cairosvg():
+    """Returns the cairosvg module, or None if it (or native Cairo) is missing."""
+    try:
+        import cairosvg
+    except Exception:
+        return None
+    return cairosvg
+
 
-    return True
+def build_pdf_fallback_png_index(fallback_root=PDF_FALLBACK_PNG_DIR):
+    """Index the Mermaid PDF fallback PNGs with a single directory scan.
 
+    Returns {"by_path": {"<lang>/<name>.png": path}, "by_name": {"<name>.png": [paths]}}.
+    The language-relative key tells `es/x.png` and `en/x.png` apart.
+    """
+    index = {"by_path": {}, "by_name": {}}
+    for root, dirs, files in os.walk(fallback_root):
+        dirs.sort()
+        for filename in sorted(files):
+            if not filename.lower().endswith(".png"):
+                continue
+            path = os.path.join(root, filename)
+            rel = os.path.relpath(path, fallback_root).replace(os.sep, "/")
+            index["by_path"][rel] = path
+            index["by_name"].setdefault(filename, []).append(path)
+    return index
+
+
+def find_pdf_fallback_png_for_svg(svg_path, index, lang=None):
+    """Find a pre-rendered PDF PNG fallback for a generated diagram SVG.
 
-def find_pdf_fallback_png_for_svg(svg_path):
-    """Find a pre-rendered PDF PNG fallback for a generated diagram SVG."""
+    Prefers the PNG of the language being exported; a basename found in
+    another language is only used when it is unambiguous.
+    """
     basename = os.path.splitext(os.path.basename(svg_path))[0] + ".png"
-    fallback_root = os.path.join(PROJECT_ROOT, "book", "_static", "generated", "diagrams_pdf")
-    matches = glob.glob(os.path.join(fallback_root, "**", basename), recursive=True)
-    return matches[0] if matches else None
+    if lang and lang != "default":
+        match = index["by_path"].get(f"{lang}/{basename}")
+        if match:
+            return match
+    matches = index["by_name"].get(basename, [])
+    return matches[0] if len(matches) == 1 else None
 
 
 def convert_svg_to_pdf_with_svglib(svg_path, pdf_path):
@@ -550,15 +787,19 @@ def convert_svg_to_pdf_with_svglib(svg_path, pdf_path):
     renderPDF.drawToFile(drawing, pdf_path)
 
 
-def mirror_shared_asset_paths_for_latex(latex_build_dir):
-    """Mirror root `_static` and `_images` into nested paths referenced by Sphinx LaTeX.
+def mirror_shared_asset_paths_for_latex(latex_build_dir, needed_refs=None):
+    """Stage root `_static`/`_images` files at the nested paths Sphinx LaTeX references.
 
     In standalone per-language builds, MyST/Sphinx may serialize an image
     reference such as `_static/logo.png` from a nested source page as
     `es/05_contenidos_basicos/_static/logo.png`.  The real files live in the
     LaTeX build root `_static/`.  The same can happen with `_images/` assets.
-    Mirroring those directories into the referenced
-    nested locations avoids OS-specific path hacks and works on all runners.
+    Only the files the TeX actually references are placed there, as hard
+    links where the filesystem allows (copies otherwise), instead of copying
+    the whole `_static` (videos, published PDFs...) per nested prefix.
+
+    `needed_refs` comes from rewrite_tex_references; without it the .tex
+    files are scanned here.
     """
     asset_sources = {
         "_static": os.path.join(latex_build_dir, "_static"),
@@ -567,34 +808,57 @@ def mirror_shared_asset_paths_for_latex(latex_build_dir):
     if not os.path.isdir(asset_sources["_static"]):
         asset_sources["_static"] = os.path.join(PROJECT_ROOT, BOOK_DIR, "_static")
 
-    needed_dirs = {"_static": set(), "_images": set()}
-    for tex_path in glob.glob(os.path.join(latex_build_dir, "*.tex")):
-        with open(tex_path, "r", encoding="utf-8") as f:
-            text = f.read()
-        for asset_dir in needed_dirs:
-            pattern = rf"([A-Za-z0-9_./-]+/{re.escape(asset_dir)}/)"
-            for match in re.finditer(pattern, text):
-                prefix = match.group(1).strip("./")
-                if prefix and prefix != f"{asset_dir}/":
-                    needed_dirs[asset_dir].add(os.path.join(latex_build_dir, prefix))
+    if needed_refs is None:
+        needed_refs = {"_static": set(), "_images": set()}
+        for tex_path in glob.glob(os.path.join(latex_build_dir, "*.tex")):
+            with open(tex_path, "r", encoding="utf-8") as f:
+                collect_latex_asset_refs(f.read(), latex_build_dir, needed_refs)
 
     for asset_dir, source_dir in asset_sources.items():
         if not os.path.isdir(source_dir):
             continue
-        for dest_dir in sorted(needed_dirs[asset_dir]):
+        staged = {}
+        for dest_dir, rel_path, ext in sorted(needed_refs[asset_dir], key=lambda ref: (ref[0], ref[1], ref[2] or "")):
             if os.path.abspath(dest_dir) == os.path.abspath(source_dir):
                 continue
-            parent = os.path.dirname(dest_dir)
-            os.makedirs(parent, exist_ok=True)
-            if os.path.exists(dest_dir):
-                continue
-            shutil.copytree(source_dir, dest_dir)
+            rel_files = resolve_asset_ref(source_dir, rel_path, ext)
+            if not rel_files:
+                print(f"   ⚠️ No se encontró {asset_dir}/{rel_path}{ext or ''} referenciado en LaTeX")
+            for rel_file in rel_files:
+                dest_file = os.path.join(dest_dir, rel_file)
+                if os.path.exists(dest_file):
+                    continue
+                os.makedirs(os.path.dirname(dest_file), exist_ok=True)
+                place_file(os.path.join(source_dir, rel_file), dest_file, link=True)
+                staged.setdefault(dest_dir, 0)
+                staged[dest_dir] += 1
+        for dest_dir, count in staged.items():
             print(
-                f"   📁 {asset_dir} replicado para LaTeX: "
+                f"   📎 {count} archivo(s) de {asset_dir} enlazados para LaTeX en: "
                 f"{os.path.relpath(dest_dir, latex_build_dir)}"
             )
 
 
+def resolve_asset_ref(source_dir, rel_path, ext):
+    """Returns the files in source_dir a TeX asset reference may point to.
+
+    `\\includegraphics` also accepts a path without extension, in which case
+    every file with that stem is staged.
+    """
+    rel_path = rel_path.replace("/", os.sep)
+    candidates = [rel_path + ext, rel_path] if ext else [rel_path]
+    for candidate in candidates:
+        if os.path.isfile(os.path.join(source_dir, candidate)):
+            return [candidate]
+    if ext:
+        return []
+    return sorted(
+        os.path.relpath(match, source_dir)
+        for match in glob.glob(os.path.join(source_dir, glob.escape(rel_path) + ".*"))
+        if os.path.isfile(match)
+    )
+
+
 def copy_root_latex_support_files(latex_build_dir):
     """Copy top-level helper files like latexmkrc into the build dir."""
     templates_root = os.path.abspath("latex_templates")
@@ -612,50 +876,325 @@ def build_pdf_for_lang(lang, engine_name):
     """Builds the PDF for a specific language using a standalone temporary project."""
     print(f"\n🚀 Iniciando generación de PDF STANDALONE para: {lang.upper()}...")
 
+    pdf_filename = "teachbook.pdf" if lang == "default" else f"teachbook_{lang}.pdf"
+    dest_pdf_path = os.path.join(STATIC_DIR, pdf_filename)
+
+    with TIMER.phase("fingerprint", lang):
+        fingerprint = compute_pdf_fingerprint(lang, engine_name)
+        unchanged = not FORCE and pdf_is_up_to_date(dest_pdf_path, fingerprint)
+    if unchanged:
+        print(f"⏭️  PDF de '{lang}' sin cambios (misma huella de entradas): {dest_pdf_path}")
+        print("   Usa --force para regenerarlo igualmente.")
+        return True
+
+    latex_build_dir = None
+    if REUSE_HTML_BUILD and lang != "default":
+        with TIMER.phase("jupyter-book-latex-reuse", lang):
+            latex_build_dir = generate_latex_from_html_build(lang)
+
+    if not latex_build_dir:
+        with TIMER.phase("sync", lang):
+            src_dir = prepare_pdf_project(lang)
+
+        with TIMER.phase("jupyter-book-latex", lang):
+            latex_build_dir = generate_latex_sources(lang, src_dir)
+        if not latex_build_dir:
+            return False
+
+    with TIMER.phase("latex-templates", lang):
+        apply_latex_templates(lang, latex_build_dir)
+
+    with TIMER.phase("svg-conversion", lang):
+        replacements = prepare_svg_images_for_latex(latex_build_dir, lang)
+    if replacements is None:
+        return False
+
+    with TIMER.phase("tex-references", lang):
+        asset_refs = rewrite_tex_references(latex_build_dir, replacements)
+        mirror_shared_asset_paths_for_latex(latex_build_dir, asset_refs)
+
+    if LATEX_WORKSPACE:
+        with TIMER.phase("latex-workspace", lang):
+            latex_build_dir = sync_latex_workspace(lang, latex_build_dir)
+
+    compile_project = compile_latex_project_by_chapters if CHAPTERS else compile_latex_project
+    with TIMER.phase("latex-compile", lang):
+        ok = compile_project(lang, latex_build_dir, engine_name, dest_pdf_path)
+        if not ok and LATEX_WORKSPACE and clear_latex_intermediates(latex_build_dir):
+            # A broken .aux from an earlier failure can keep failing: retry cold.
+            print("   🧹 Reintentando sin auxiliares de la compilación anterior...")
+            ok = compile_project(lang, latex_build_dir, engine_name, dest_pdf_path)
+
+    if ok:
+        write_pdf_fingerprint(dest_pdf_path, fingerprint)
+    if ok and REUSE_HTML_BUILD:
+        # The HTML site was built before this PDF: publish the new file too.
+        publish_pdf_to_html_output(dest_pdf_path)
+    return ok
+
+
+def latex_intermediate_filter(latex_dir):
+    """Predicate for the engine outputs of `latex_dir`'s jobs that a workspace keeps.
+
+    Only top-level `<job>.aux`, `<job>.toc`, `<job>.pdf`... survive, where
+    `<job>` is the main .tex (plus pdf_chapters' chunk jobs with --chapters).
+    A PDF or .aux of a job the current sources no longer produce is pruned
+    like any other file that is not in the sync manifest.
+    """
+    main_tex = find_main_tex(latex_dir)
+    jobs = {os.path.splitext(main_tex)[0]} if main_tex else set()
+    job_prefixes = (pdf_chapters.CHUNK_JOB_PREFIX, pdf_chapters.CONTENTS_BASENAME) if CHAPTERS else ()
+
+    def is_latex_intermediate(rel_path):
+        if "/" in rel_path:
+            return False
+        for suffix in LATEX_INTERMEDIATE_SUFFIXES:
+            if rel_path.endswith(suffix):
+                job = rel_path[: -len(suffix)]
+                return job in jobs or job.startswith(job_prefixes)
+        return False
+
+    return is_latex_intermediate
+
+
+def sync_latex_workspace(lang, latex_build_dir):
+    """Mirrors the generated LaTeX dir into `.cache/latex/<lang>` and returns it.
+
+    The fresh Sphinx output is synced by content hash, so unchanged .tex,
+    .sty and figure files keep their old timestamps and only real changes
+    are copied. Engine intermediates from the previous compile are kept:
+    latexmk's dependency tracking can then skip passes it does not need,
+    and Tectonic starts from the previous .aux/.toc instead of empty ones.
+    """
+    workspace_dir = os.path.join(LATEX_WORKSPACE_DIR, lang)
+    os.makedirs(LATEX_WORKSPACE_DIR, exist_ok=True)
+    sync_tree(latex_build_dir, workspace_dir, keep=latex_intermediate_filter(latex_build_dir))
+    return workspace_dir
+
+
+def clear_latex_intermediates(workspace_dir):
+    """Deletes the top-level engine intermediates of a workspace; returns how many."""
+    is_latex_intermediate = latex_intermediate_filter(workspace_dir)
+    removed = 0
+    for name in os.listdir(workspace_dir):
+        path = os.path.join(workspace_dir, name)
+        if os.path.isfile(path) and is_latex_intermediate(name):
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+def compute_pdf_fingerprint(lang, engine_name):
+    """Hashes every input of the PDF of `lang` plus the tools that build it.
+
+    Inputs are content hashes (not mtimes) keyed by project-relative path,
+    and the engine is the resolved binary plus its `--version`, so switching
+    `--engine` between names that resolve to the same tool still matches.
+    Modes with their own LaTeX pipeline (--chapters, --reuse-html-build) hash
+    the script that implements it.
+    """
+    book_root = os.path.join(PROJECT_ROOT, BOOK_DIR)
+    static_root = os.path.join(book_root, "_static")
+    inputs = {}
+
+    def add_tree(root, skip_dirs=()):
+        for dirpath, dirs, files in os.walk(root):
+            dirs[:] = sorted(d for d in dirs if d not in skip_dirs and not d.startswith("."))
+            for filename in files:
+                add_file(os.path.join(dirpath, filename))
+
+    def add_file(path):
+        if not os.path.isfile(path):
+            return
+        name = os.path.basename(path)
+        if path.startswith(static_root + os.sep):
+            if os.path.splitext(name)[1].lower() in FINGERPRINT_IGNORED_EXTENSIONS:
+                return
+            if name.startswith("teachbook") and name.endswith(".pdf"):
+                return
+        rel = os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "/")
+        inputs[rel] = file_sha256(path)
+
     if lang == "default":
-        config_file = "_config.yml"
-        toc_file = "_toc.yml"
-        pdf_filename = "teachbook.pdf"
-        src_dir = os.path.abspath(BOOK_DIR)
-        temp_mode = False
+        add_tree(book_root, skip_dirs=("_build", "_static"))
     else:
-        config_file = f"_config_{lang}.yml"
-        toc_file = f"_toc_{lang}.yml"
-        pdf_filename = f"teachbook_{lang}.pdf"
-        temp_mode = True
-
-    if temp_mode:
-        # Use _temp_pdf_{lang} at ROOT to avoid recursion/exclusion issues
-        temp_root = os.path.abspath(os.path.join(os.getcwd(), f"_temp_pdf_{lang}"))
-        if os.path.exists(temp_root):
-            shutil.rmtree(temp_root)
-        os.makedirs(temp_root)
-
-        lang_src = os.path.join(BOOK_DIR, lang)
-        lang_dst = os.path.join(temp_root, lang)
-        print(f"📂 Preparando entorno standalone PDF: {temp_root}")
-        shutil.copytree(lang_src, lang_dst)
-
-        static_src = os.path.join(BOOK_DIR, "_static")
-        if os.path.exists(static_src):
-            shutil.copytree(static_src, os.path.join(temp_root, "_static"))
-
-        dest_config = os.path.join(temp_root, "_config.yml")
-        shutil.copy2(os.path.join(BOOK_DIR, config_file), dest_config)
-        shutil.copy2(
-            os.path.join(BOOK_DIR, toc_file), os.path.join(temp_root, "_toc.yml")
-        )
+        add_tree(os.path.join(book_root, lang))
+        add_file(os.path.join(book_root, f"_config_{lang}.yml"))
+        add_file(os.path.join(book_root, f"_toc_{lang}.yml"))
+    add_tree(static_root)
+    add_tree(os.path.join(PROJECT_ROOT, "latex_templates"))
+    add_file(os.path.abspath(__file__))
 
-        # Sanitize config to prevent self-exclusion
-        sanitize_config(dest_config)
-        sanitize_kroki_blocks_for_pdf(temp_root)
-        src_dir = temp_root
-    else:
-        src_dir = os.path.abspath(BOOK_DIR)
+    engine_path = resolve_latex_engine(engine_name)
+    try:
+        from importlib.metadata import version as package_version
+
+        jupyter_book_version = package_version("jupyter-book")
+    except Exception:
+        jupyter_book_version = ""
+    tooling = {
+        "engine": tool_path_for_fingerprint(engine_path) if engine_path else "",
+        "engine_version": command_version(engine_path) if engine_path else "",
+        "jupyter_book": jupyter_book_version,
+    }
+    if CHAPTERS:
+        # A stitched draft must not satisfy a later full export (or vice versa).
+        tooling["chapters"] = True
+        add_file(os.path.join(SCRIPT_DIR, "pdf_chapters.py"))
+    if REUSE_HTML_BUILD:
+        # latex_from_html_build.py sets up Sphinx and rewrites the Kroki diagrams.
+        tooling["reuse_html_build"] = True
+        add_file(os.path.join(SCRIPT_DIR, "latex_from_html_build.py"))
+
+    payload = json.dumps({"tooling": tooling, "inputs": inputs}, sort_keys=True)
+    return {
+        "version": PDF_FINGERPRINT_VERSION,
+        "fingerprint": hashlib.sha256(payload.encode("utf-8")).hexdigest(),
+        "tooling": tooling,
+        "inputs": inputs,
+    }
+
+
+def tool_path_for_fingerprint(path):
+    """Project-relative path for tools inside the project (.venv), else absolute."""
+    path = os.path.abspath(path)
+    rel = os.path.relpath(path, PROJECT_ROOT)
+    if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+        return path.replace(os.sep, "/")
+    return rel.replace(os.sep, "/")
+
+
+def pdf_fingerprint_path(pdf_path):
+    """`.cache/pdf/<pdf name>.fingerprint.json`: kept out of the published `_static`."""
+    return os.path.join(PROJECT_ROOT, PDF_CACHE_DIR, os.path.basename(pdf_path) + ".fingerprint.json")
+
+
+def pdf_is_up_to_date(pdf_path, fingerprint):
+    """True if the PDF exists and was built from exactly these inputs."""
+    if not os.path.isfile(pdf_path) or os.path.getsize(pdf_path) == 0:
+        return False
+    try:
+        with open(pdf_fingerprint_path(pdf_path), "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if stored.get("version") == fingerprint["version"] and stored.get("fingerprint") == fingerprint["fingerprint"]:
+        return True
+
+    old_inputs = stored.get("inputs", {})
+    changed = sorted(
+        rel
+        for rel in set(old_inputs) | set(fingerprint["inputs"])
+        if old_inputs.get(rel) != fingerprint["inputs"].get(rel)
+    )
+    if changed:
+        preview = ", ".join(changed[:5]) + (" ..." if len(changed) > 5 else "")
+        print(f"🔁 {len(changed)} entrada(s) cambiada(s) desde el último PDF: {preview}")
+    elif stored.get("tooling") != fingerprint["tooling"]:
+        print("🔁 Cambió el motor o las herramientas desde el último PDF.")
+    return False
+
+
+def write_pdf_fingerprint(pdf_path, fingerprint):
+    """Stores the input fingerprint of the PDF under `.cache/pdf/`."""
+    path = pdf_fingerprint_path(pdf_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(fingerprint, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def generate_latex_from_html_build(lang):
+    """Runs the LaTeX builder in build_book.py's workspace, reusing its doctrees.
+
+    `.cache/build/<lang>` keeps the Sphinx environment (`_build/.doctrees`)
+    of the last HTML build, so Markdown, MyST and bibtex are parsed once per
+    language for both outputs. scripts/latex_from_html_build.py replaces the
+    Kroki diagrams with the same textual fallback as
+    sanitize_kroki_blocks_for_pdf, and refuses to re-read changed pages
+    (that would call kroki.io). Returns the LaTeX dir, or None so the caller
+    falls back to the PDF project.
+    """
+    workspace = os.path.abspath(os.path.join(HTML_BUILD_CACHE_DIR, lang))
+    if not os.path.isdir(os.path.join(workspace, "_build", ".doctrees")):
+        print(f"ℹ️  No hay un build HTML previo en {workspace}.")
+        print("   Ejecuta antes scripts/build_book.py. Se usa el proyecto PDF independiente.")
+        return None
+
+    jupyter_book = get_jupyter_book()
+    if not jupyter_book:
+        return None
 
+    latex_build_dir = os.path.join(workspace, "_build", "latex")
+    # Only the LaTeX output is reset; the shared doctrees stay.
+    if os.path.exists(latex_build_dir):
+        shutil.rmtree(latex_build_dir)
+
+    print(f"📝 Generando LaTeX reutilizando el entorno Sphinx del build HTML ({lang})...", flush=True)
+    # The Python that has jupyter-book installed (the .venv one, normally).
+    python = os.path.join(os.path.dirname(jupyter_book), "python.exe" if os.name == "nt" else "python")
+    if not os.path.isfile(python):
+        python = sys.executable
+    cmd = [python, os.path.join(SCRIPT_DIR, "latex_from_html_build.py"), workspace]
+    try:
+        subprocess.run(cmd, check=True)
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"⚠️  Falló el build LaTeX sobre el entorno HTML ({lang}): {e}")
+        print("   Reintentando con el proyecto PDF independiente...")
+        return None
+    return latex_build_dir
+
+
+def publish_pdf_to_html_output(pdf_path):
+    """Copies a freshly built PDF into the already published HTML `_static`."""
+    if not os.path.isdir(FINAL_HTML_STATIC_DIR):
+        return
+    dest = os.path.join(FINAL_HTML_STATIC_DIR, os.path.basename(pdf_path))
+    place_file(pdf_path, dest)
+    print(f"   📎 PDF actualizado también en la web: {dest}")
+
+
+def prepare_pdf_project(lang):
+    """Returns the Sphinx project to build `lang` from, syncing it if needed."""
+    if lang == "default":
+        return os.path.abspath(BOOK_DIR)
+
+    config_file = f"_config_{lang}.yml"
+    toc_file = f"_toc_{lang}.yml"
+
+    # Use .cache/pdf/{lang} outside book/ to avoid recursion/exclusion issues.
+    # The project persists between runs and is synced, not recopied.
+    temp_root = os.path.abspath(os.path.join(os.getcwd(), PDF_CACHE_DIR, lang))
+    os.makedirs(temp_root, exist_ok=True)
+
+    lang_src = os.path.join(BOOK_DIR, lang)
+    lang_dst = os.path.join(temp_root, lang)
+    print(f"📂 Preparando entorno standalone PDF: {temp_root}")
+    # Copy (never hard-link) the Markdown: sanitize_kroki_blocks_for_pdf
+    # rewrites these files in place. It only touches this <lang>/ copy.
+    sync_tree(lang_src, lang_dst)
+
+    static_src = os.path.join(BOOK_DIR, "_static")
+    if os.path.exists(static_src):
+        sync_tree(static_src, os.path.join(temp_root, "_static"), link=True)
+
+    dest_config = os.path.join(temp_root, "_config.yml")
+    shutil.copy2(os.path.join(BOOK_DIR, config_file), dest_config)
+    shutil.copy2(
+        os.path.join(BOOK_DIR, toc_file), os.path.join(temp_root, "_toc.yml")
+    )
+
+    # Sanitize config to prevent self-exclusion
+    sanitize_config(dest_config)
+    # Only the copied content: _static is hard-linked to book/_static.
+    sanitize_kroki_blocks_for_pdf(lang_dst)
+    return temp_root
+
+
+def generate_latex_sources(lang, src_dir):
+    """Runs the Jupyter Book LaTeX builder. Returns the LaTeX build dir or None."""
     build_dir = os.path.join(src_dir, "_build")
     latex_build_dir = os.path.join(build_dir, "latex")
-    dest_pdf_path = os.path.join(STATIC_DIR, pdf_filename)
 
     if os.path.exists(build_dir):
         shutil.rmtree(build_dir)
@@ -672,20 +1211,21 @@ def build_pdf_for_lang(lang, engine_name):
             else:
                 print("   python scripts/setup_env.py")
                 print("   .venv/bin/python scripts/export_pdf.py")
-            return False
+            return None
 
         cmd = [jupyter_book, "build", "--builder", "latex", src_dir, "--all"]
         subprocess.run(cmd, shell=(os.name == "nt"), check=True)
     except subprocess.CalledProcessError as e:
         print(f"❌ Error en jupyter-book build ({lang}): {e}")
-        return False
+        return None
     except OSError as e:
         print(f"❌ No se pudo ejecutar jupyter-book ({lang}): {e}")
-        return False
-    finally:
-        if temp_mode and not os.path.exists(latex_build_dir) and os.path.exists(src_dir):
-            shutil.rmtree(src_dir)
+        return None
+    return latex_build_dir
+
 
+def apply_latex_templates(lang, latex_build_dir):
+    """Writes metadata and overlays latex_templates/common + latex_templates/<lang>."""
     print("🎨 Aplicando plantillas LaTeX personalizadas...", flush=True)
     templates_root = os.path.abspath("latex_templates")
 
@@ -713,26 +1253,32 @@ def build_pdf_for_lang(lang, engine_name):
             if os.path.isfile(s):
                 shutil.copy2(s, d)
 
-    if not prepare_svg_images_for_latex(latex_build_dir):
-        return False
-    mirror_shared_asset_paths_for_latex(latex_build_dir)
 
+def find_main_tex(latex_dir):
+    """File name of the book's main .tex in a LaTeX dir, or None."""
+    tex_files = [
+        os.path.basename(f)
+        for f in glob.glob(os.path.join(latex_dir, "*.tex"))
+        if os.path.basename(f) not in ["bookmetadata.tex", "language_support.tex"]
+        and not os.path.basename(f).startswith((pdf_chapters.CHUNK_JOB_PREFIX, pdf_chapters.CONTENTS_BASENAME))
+    ]
+    if not tex_files:
+        return None
+    # Prioritize python.tex or the first file available
+    return "python.tex" if "python.tex" in tex_files else tex_files[0]
+
+
+def compile_latex_project(lang, latex_build_dir, engine_name, dest_pdf_path):
+    """Compiles the main .tex of a prepared LaTeX dir and copies the PDF to dest."""
     print(f"📂 Compilando PDF en {latex_build_dir}...")
     current_dir = os.getcwd()
     try:
         os.chdir(latex_build_dir)
-        tex_files = [
-            f
-            for f in glob.glob("*.tex")
-            if f not in ["bookmetadata.tex", "language_support.tex"]
-        ]
-        if not tex_files:
+        main_tex = find_main_tex(".")
+        if not main_tex:
             print("❌ No se encontró archivo .tex compatible.")
             return False
 
-        # Prioritize python.tex or the first file available
-        main_tex = "python.tex" if "python.tex" in tex_files else tex_files[0]
-
         engine_candidates = resolve_latex_engine_candidates(engine_name)
         if not engine_candidates:
             print(f"❌ No se encontró el motor solicitado: {engine_name}.")
@@ -746,7 +1292,7 @@ def build_pdf_for_lang(lang, engine_name):
                         f"🔁 Motor candidato {candidate_index}/{len(engine_candidates)}: "
                         f"{candidate_name}"
                     )
-                compile_latex_with_engine(tex_engine_path, main_tex)
+                compile_latex_with_engine(tex_engine_path, main_tex, log_label=lang)
                 last_error = None
                 break
             except subprocess.CalledProcessError as exc:
@@ -758,11 +1304,15 @@ def build_pdf_for_lang(lang, engine_name):
         if last_error is not None:
             raise last_error
 
-        found_pdf = glob_pdf(".")
+        # A workspace may still hold other jobs' PDFs: prefer this job's own.
+        main_pdf = os.path.splitext(main_tex)[0] + ".pdf"
+        found_pdf = os.path.abspath(main_pdf) if os.path.isfile(main_pdf) else glob_pdf(".")
         if found_pdf:
             os.chdir(current_dir)
             ensure_static_dir()
-            shutil.copy(found_pdf, dest_pdf_path)
+            # Replace, never write in place: book/_static is hard-linked into
+            # the HTML workspaces, whose pages would then look changed.
+            place_file(found_pdf, dest_pdf_path)
             print(f"🎉 PDF de '{lang}' exportado a: {dest_pdf_path}")
             return True
         else:
@@ -774,8 +1324,144 @@ def build_pdf_for_lang(lang, engine_name):
         return False
     finally:
         os.chdir(current_dir)
-        if temp_mode and os.path.exists(src_dir):
-            shutil.rmtree(src_dir)
+
+
+def compile_latex_project_by_chapters(lang, latex_build_dir, engine_name, dest_pdf_path):
+    """--chapters: compiles python.tex split per part/chapter in parallel and stitches it.
+
+    See pdf_chapters.py for the two passes and their limits. Falls back to
+    compile_latex_project when the document cannot be split or PyMuPDF is
+    not installed.
+    """
+    main_tex_path = os.path.join(latex_build_dir, "python.tex")
+    pymupdf = pdf_chapters.import_pymupdf()
+    split = None
+    if pymupdf is None:
+        print("⚠️  --chapters necesita PyMuPDF (pip install PyMuPDF); se compila el libro completo.")
+    elif os.path.isfile(main_tex_path):
+        with open(main_tex_path, "r", encoding="utf-8") as f:
+            split = pdf_chapters.split_latex_document(f.read())
+        if split is None:
+            print("⚠️  No se pudo dividir python.tex por partes/capítulos; se compila completo.")
+    if split is None:
+        return compile_latex_project(lang, latex_build_dir, engine_name, dest_pdf_path)
+
+    engine_candidates = resolve_latex_engine_candidates(engine_name)
+    if not engine_candidates:
+        print(f"❌ No se encontró el motor solicitado: {engine_name}.")
+        return False
+
+    front_name, names = pdf_chapters.chunk_job_names(split)
+    workers = get_chapter_workers(len(names))
+    print(
+        f"🧩 Compilando {len(names)} bloques de '{lang}' por separado "
+        f"({workers} a la vez) en {latex_build_dir}..."
+    )
+
+    def path_of(name, ext):
+        return os.path.join(latex_build_dir, name + ext)
+
+    def write_tex(name, text):
+        with open(path_of(name, ".tex"), "w", encoding="utf-8", newline="\n") as f:
+            f.write(text)
+
+    # Pass 1: part/chapter offsets counted in the source, every piece at page 1.
+    starts = []
+    part = chapter = 0
+    for index, name in enumerate(names):
+        starts.append((part, chapter))
+        write_tex(name, pdf_chapters.piece_document(split, index, 1, part, chapter))
+        parts, chapters = pdf_chapters.count_sectioning(split["pieces"][index])
+        part, chapter = part + parts, chapter + chapters
+    if not compile_latex_chunks(lang, latex_build_dir, names, engine_candidates, workers):
+        return False
+
+    # Pass 2: shared labels, exact counters and first page of every piece.
+    first_pages = []
+    counts = []
+    page = 1
+    part = chapter = 0
+    for index, name in enumerate(names):
+        page_count = pdf_chapters.pdf_page_count(pymupdf, path_of(name, ".pdf"))
+        ended = pdf_chapters.read_chunk_counters(path_of(name, ".aux"))
+        if ended is None:
+            parts, chapters = pdf_chapters.count_sectioning(split["pieces"][index])
+        else:
+            parts, chapters = ended[0] - starts[index][0], ended[1] - starts[index][1]
+        labels_name = f"{name}-labels.aux"
+        pdf_chapters.write_shared_labels(
+            os.path.join(latex_build_dir, labels_name),
+            [path_of(other, ".aux") for other in names if other != name],
+        )
+        first_pages.append(page)
+        counts.append(page_count)
+        write_tex(name, pdf_chapters.piece_document(split, index, page, part, chapter, labels_name))
+        page += page_count
+        part, chapter = part + parts, chapter + chapters
+    if not compile_latex_chunks(lang, latex_build_dir, names, engine_candidates, workers):
+        return False
+
+    shifted = [
+        name
+        for name, count in zip(names, counts)
+        if pdf_chapters.pdf_page_count(pymupdf, path_of(name, ".pdf")) != count
+    ]
+    if shifted:
+        print(
+            "   ⚠️ Cambió el número de páginas entre pasadas en "
+            f"{', '.join(shifted)}: la numeración posterior puede desplazarse."
+        )
+
+    # Title page and table of contents, read from the merged pass-2 .toc.
+    pdf_chapters.merge_toc_files(
+        [path_of(name, ".toc") for name in names],
+        os.path.join(latex_build_dir, pdf_chapters.CONTENTS_BASENAME + ".toc"),
+    )
+    write_tex(front_name, pdf_chapters.front_document(split))
+    if not compile_latex_chunks(lang, latex_build_dir, [front_name], engine_candidates, 1):
+        return False
+
+    ensure_static_dir()
+    stitched_pdf = pdf_chapters.stitch_pdfs(
+        pymupdf,
+        [path_of(name, ".pdf") for name in [front_name] + names],
+        path_of(f"{pdf_chapters.CHUNK_JOB_PREFIX}book", ".pdf"),
+    )
+    place_file(stitched_pdf, dest_pdf_path)
+    print(f"🎉 PDF de '{lang}' (por capítulos, modo borrador) exportado a: {dest_pdf_path}")
+    return True
+
+
+def get_chapter_workers(chunk_count):
+    """Splits the CPU cores between the --jobs language processes."""
+    cores = os.cpu_count() or 1
+    return max(1, min(chunk_count, cores // max(1, get_jobs_option())))
+
+
+def compile_latex_chunks(lang, latex_build_dir, names, engine_candidates, workers):
+    """Compiles `<name>.tex` for every name with up to `workers` engine processes."""
+
+    def compile_chunk(name):
+        for candidate_name, tex_engine_path in engine_candidates:
+            try:
+                compile_latex_with_engine(
+                    tex_engine_path,
+                    name + ".tex",
+                    log_label=f"{lang}-{name}",
+                    cwd=latex_build_dir,
+                )
+                return True
+            except subprocess.CalledProcessError as exc:
+                print(f"⚠️  Falló el motor {candidate_name} en {name}: {exc}")
+        return False
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = dict(zip(names, pool.map(compile_chunk, names)))
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        print(f"❌ Error compilando {lang}: fallaron {', '.join(failed)}")
+        return False
+    return True
 
 
 def sanitize_config(config_path):
@@ -815,8 +1501,9 @@ def sanitize_kroki_blocks_for_pdf(src_dir):
 
     HTML builds can use sphinx-kroki directly, but PDF export must not fail just
     because kroki.io is slow or unavailable. This function only edits the
-    throw-away _temp_pdf_<lang> copy. It leaves the book sources untouched and
-    replaces real Kroki directives with a PDF-safe note plus the diagram source.
+    copied content dir `.cache/pdf/<lang>/<lang>` (never the hard-linked
+    `_static`). It leaves the book sources untouched and replaces real Kroki
+    directives with a PDF-safe note plus the diagram source.
     """
     replaced_total = 0
 
@@ -853,22 +1540,14 @@ def sanitize_kroki_blocks_for_pdf(src_dir):
                         break
                     i += 1
 
-                source_lines = []
-                for block_line in block_lines[1:-1]:
-                    block_stripped = block_line.strip()
-                    if not block_stripped or block_stripped.startswith(":"):
-                        continue
-                    source_lines.append(block_line.rstrip("\n"))
-                source = "\n".join(source_lines).strip() or "(fuente Kroki no disponible)"
+                source = kroki_fallback_source(block_lines[1:-1])
 
                 new_lines.extend(
                     [
-                        "````{admonition} Diagrama disponible en la versión HTML\n",
+                        f"````{{admonition}} {KROKI_FALLBACK_TITLE}\n",
                         ":class: note\n",
                         "\n",
-                        "Este diagrama Kroki se muestra en la versión HTML del libro. "
-                        "Para que el PDF sea autocontenido y no dependa de kroki.io, "
-                        "se incluye aquí su fuente textual.\n",
+                        f"{KROKI_FALLBACK_TEXT}\n",
                         "\n",
                         "```text\n",
                     ]
@@ -894,10 +1573,112 @@ def sanitize_kroki_blocks_for_pdf(src_dir):
         )
 
 
+def get_jobs_option():
+    """Reads `--jobs N` from the command line.
+
+    Defaults to 1 (sequential). `--jobs 0` or `--jobs auto` uses one worker
+    per CPU core.
+    """
+    if "--jobs" not in sys.argv:
+        return 1
+    try:
+        value = sys.argv[sys.argv.index("--jobs") + 1].strip().lower()
+    except IndexError:
+        print("❌ Falta el valor de --jobs. Usa: --jobs N (o --jobs auto)")
+        sys.exit(1)
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        jobs = int(value)
+    except ValueError:
+        print(f"❌ Valor no válido para --jobs: {value}")
+        sys.exit(1)
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def build_pdf_for_lang_logged(lang, engine_name):
+    """Process-pool entry point: builds one PDF with all its output in its own log.
+
+    Redirects the worker's stdout/stderr file descriptors (so jupyter-book and
+    the LaTeX engine are captured too) to `.build_logs/pdf-<lang>-<ts>.log`.
+    Returns (ok, log_path, phase timings).
+    """
+    log_dir = os.path.join(PROJECT_ROOT, ".build_logs")
+    os.makedirs(log_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    log_path = os.path.join(log_dir, f"pdf-{lang}-{timestamp}.log")
+
+    TIMER.drain()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = (os.dup(1), os.dup(2))
+    with open(log_path, "w", encoding="utf-8", newline="\n") as log:
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+        try:
+            ok = build_pdf_for_lang(lang, engine_name)
+        except Exception as exc:
+            print(f"❌ Error inesperado exportando {lang}: {exc}")
+            ok = False
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            for fd in saved_fds:
+                os.close(fd)
+    return ok, log_path, TIMER.drain()
+
+
+def build_pdfs_parallel(languages, engine_name, jobs):
+    """Exports several languages at once. Returns the number of PDFs generated.
+
+    Every language already builds in its own `.cache/pdf/<lang>` project and
+    writes its own `teachbook_<lang>.pdf`, so they are fully independent.
+    Output goes to one log per language; a combined summary is printed here.
+    """
+    workers = min(jobs, len(languages))
+    print(f"⚡ Exportando {len(languages)} PDFs en paralelo ({workers} procesos)...")
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(build_pdf_for_lang_logged, lang, engine_name): lang
+            for lang in languages
+        }
+        for future in as_completed(futures):
+            lang = futures[future]
+            try:
+                ok, log_path, records = future.result()
+                TIMER.extend(records)
+            except Exception as exc:  # e.g. the worker process died
+                ok, log_path = False, None
+                print(f"❌ El proceso de '{lang}' terminó de forma inesperada: {exc}")
+            results[lang] = (ok, log_path)
+            print(f"   {'✅' if ok else '❌'} {lang}: {'PDF generado' if ok else 'falló'}")
+
+    print("\n📋 Resumen de exportación PDF:")
+    for lang in languages:
+        ok, log_path = results[lang]
+        print(f"   {'✅' if ok else '❌'} {lang:<8} log: {log_path or '-'}")
+    for lang in languages:
+        ok, log_path = results[lang]
+        if not ok and log_path and os.path.isfile(log_path):
+            with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+                tail = f.read().splitlines()[-40:]
+            print(f"\n--- Últimas líneas del log de '{lang}' ---")
+            print("\n".join(tail))
+
+    return sum(1 for ok, _log_path in results.values() if ok)
+
+
 def main():
     print("📚 Iniciando exportación de PDF multi-idioma...")
     allow_existing = "--allow-existing" in sys.argv
     engine = "tectonic"
+    jobs = get_jobs_option()
 
     if "--engine" in sys.argv:
         try:
@@ -921,13 +1702,50 @@ Uso:
   python scripts/export_pdf.py --engine auto                     # diagnóstico: Tectonic → latexmk → pdflatex
   python scripts/export_pdf.py --allow-existing                  # en CI, permite continuar si ya existen PDFs publicados
   python scripts/export_pdf.py --verbose                         # muestra el log completo en pantalla
+  python scripts/export_pdf.py --force                           # regenera aunque la huella de entradas no haya cambiado
+  python scripts/export_pdf.py --reuse-html-build                # tras build_book.py: reutiliza su entorno Sphinx
+  python scripts/export_pdf.py --latex-workspace                 # compila en `.cache/latex/<idioma>/` reutilizando .aux/.toc
+  python scripts/export_pdf.py --chapters                        # borrador: compila cada parte/capítulo en paralelo y los une
+  python scripts/export_pdf.py --jobs 2                          # exporta hasta 2 idiomas a la vez (--jobs auto: uno por núcleo)
+  python scripts/export_pdf.py --profile                         # añade cProfile por fase al informe de tiempos
 
 La opción --allow-existing es un salvavidas para despliegue: NO oculta el fallo
 de generación, pero permite publicar la web si `book/_static/teachbook_<lang>.pdf`
 ya existe y tiene contenido.
 
+Por cada PDF se guarda `.cache/pdf/teachbook_<idioma>.pdf.fingerprint.json` (fuera
+de lo que se publica) con el hash de sus entradas (Markdown, config/toc, `_static`
+salvo CSS/JS/vídeos, `latex_templates/`), del binario del motor y de su versión. Si
+nada ha cambiado, ese idioma se omite; --force lo regenera.
+
+Con --reuse-html-build el LaTeX se genera en `.cache/build/<idioma>/` (el proyecto
+de build_book.py) sin `--all`, reutilizando los doctrees ya parseados para HTML, y
+el PDF se copia también a `book/_build/html/_static/`. Los diagramas Kroki se
+sustituyen por su fuente igual que en el proyecto PDF independiente, que se usa si
+alguna página ha cambiado desde el build HTML o si el build falla.
+
+Con --latex-workspace el árbol LaTeX de cada idioma se conserva en
+`.cache/latex/<idioma>/`: solo se copian los .tex/.sty/figuras que cambian y se
+mantienen los auxiliares de la compilación anterior del documento principal (el
+resto de archivos sobrantes se borra), de modo que latexmk (y Tectonic) pueden
+ahorrarse pasadas. Si la compilación falla, se reintenta una vez sin esos
+auxiliares.
+
+Con --chapters (modo borrador) python.tex se divide en portada+índice y un
+documento por parte (o capítulo) de `_toc_<idioma>.yml`, que se compilan en
+paralelo en dos pasadas: la segunda comparte las etiquetas de todas (referencias
+cruzadas) y fija la numeración de capítulos y páginas. El PDF final se une con
+PyMuPDF con marcadores y etiquetas de página. Los enlaces entre capítulos no son
+clicables y el índice alfabético, si existe, solo cubre la última parte: para la
+versión final, sin --chapters.
+
+Con --jobs cada idioma escribe su salida en `.build_logs/pdf-<idioma>-<fecha>.log`
+y al final se muestra un resumen conjunto (con la cola del log de los que fallen).
+
 Por defecto se muestra una salida resumida para docentes. Los logs completos se
 guardan en `.build_logs/` y, si algo falla, se imprime la cola relevante del error.
+Cada ejecución deja también un informe de tiempos por fase en
+`.build_logs/pdf-timings-<fecha>.json` (y `.csv`).
 """
         )
         return
@@ -959,9 +1777,15 @@ guardan en `.build_logs/` y, si algo falla, se imprime la cola relevante del err
     print(f"🔍 Idiomas detectados para PDF: {languages}")
 
     success_count: int = 0
-    for lang in languages:
-        if build_pdf_for_lang(lang, engine):
-            success_count = success_count + 1  # type: ignore
+    try:
+        if jobs > 1 and len(languages) > 1:
+            success_count = build_pdfs_parallel(languages, engine, jobs)
+        else:
+            for lang in languages:
+                if build_pdf_for_lang(lang, engine):
+                    success_count = success_count + 1  # type: ignore
+    finally:
+        TIMER.write_report()
 
     if success_count == len(languages):
         print(f"\n✅ Todos los PDFs ({success_count}) se generaron correctamente.")
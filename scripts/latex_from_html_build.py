@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""LaTeX build on top of build_book.py's HTML workspace, with PDF-safe Kroki.
+
+`export_pdf.py --reuse-html-build` runs this inside `.cache/build/<lang>`, so
+the LaTeX builder loads the Sphinx environment pickled by the HTML build
+instead of parsing every page again. The build is jupyter-book's own
+`build --builder latex` (jupyter_book.sphinx.build_sphinx, with the same
+arguments as the CLI) plus two hooks connected on the application. They are
+not added as an extension in `_config.yml`: a new extension would make
+Sphinx re-read every page.
+
+- `doctree-resolved`: every sphinx-kroki image is replaced by the same note
+  and source block that export_pdf.sanitize_kroki_blocks_for_pdf writes into
+  the Markdown of the standalone PDF project. The PDF never depends on
+  kroki.io and matches a local `export_pdf.py` run. A Kroki node whose
+  source cannot be found stops the build instead of reaching the PDF.
+- `env-before-read-docs`: if any page would have to be read again (the HTML
+  build is older than the sources), the build stops, because reading runs
+  sphinx-kroki against the network. export_pdf.py then falls back to the
+  standalone PDF project.
+
+Usage (normally only through export_pdf.py):
+    python scripts/latex_from_html_build.py .cache/build/es
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+KROKI_FALLBACK_TITLE = "Diagrama disponible en la versión HTML"
+KROKI_FALLBACK_TEXT = (
+    "Este diagrama Kroki se muestra en la versión HTML del libro. "
+    "Para que el PDF sea autocontenido y no dependa de kroki.io, "
+    "se incluye aquí su fuente textual."
+)
+KROKI_MISSING_SOURCE = "(fuente Kroki no disponible)"
+
+
+def kroki_fallback_source(lines: list[str]) -> str:
+    """Diagram source shown in the PDF: the block's lines minus blanks and options."""
+    kept = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith(":"):
+            continue
+        kept.append(line.rstrip("\n"))
+    return "\n".join(kept).strip() or KROKI_MISSING_SOURCE
+
+
+def kroki_fallback_node(source: str):
+    """Doctree equivalent of the ````{admonition} block of the Markdown sanitizer."""
+    from docutils import nodes
+
+    admonition = nodes.admonition("", classes=["note"])
+    admonition += nodes.title(KROKI_FALLBACK_TITLE, KROKI_FALLBACK_TITLE)
+    # In the Markdown version MyST's linkify turns "kroki.io" into a link.
+    before, link, after = KROKI_FALLBACK_TEXT.partition("kroki.io")
+    paragraph = nodes.paragraph()
+    paragraph += nodes.Text(before)
+    paragraph += nodes.reference(link, link, refuri=f"http://{link}")
+    paragraph += nodes.Text(after)
+    admonition += paragraph
+    admonition += nodes.literal_block(source, source, language="text")
+    return admonition
+
+
+def kroki_node_source(node, docname: str) -> str:
+    """Source of a sphinx-kroki node; raises if sphinx-kroki no longer stores it."""
+    source = node.get("source")
+    if not isinstance(source, str):
+        from sphinx.errors import SphinxError
+
+        raise SphinxError(
+            f"{docname}: nodo Kroki sin atributo 'source' (¿cambió sphinx-kroki?); "
+            "no se genera un PDF con el diagrama a medias."
+        )
+    return source
+
+
+def replace_kroki_images(app, doctree, docname: str) -> None:
+    """Swaps Kroki diagrams (rendered or not) for their source."""
+    from docutils import nodes
+    from sphinx_kroki.kroki import KrokiNode
+
+    targets = []
+    # Rendered: KrokiToImageTransform keeps the original node in image["kroki"].
+    for image in doctree.findall(nodes.image):
+        if "kroki" in image.attributes or "kroki" in image.get("classes", []):
+            kroki = image.get("kroki")
+            targets.append((image, kroki_node_source({} if kroki is None else kroki, docname)))
+    # Not rendered (e.g. the Kroki request failed when the page was read).
+    for node in doctree.findall(KrokiNode):
+        targets.append((node, kroki_node_source(node, docname)))
+
+    for node, source in targets:
+        # With :caption: the directive wraps the node in a figure.
+        target = node.parent if isinstance(node.parent, nodes.figure) else node
+        target.replace_self(kroki_fallback_node(kroki_fallback_source(source.splitlines())))
+
+
+def refuse_reads(app, env, docnames: list[str]) -> None:
+    if docnames:
+        from sphinx.errors import SphinxError
+
+        preview = ", ".join(sorted(docnames)[:3]) + (" ..." if len(docnames) > 3 else "")
+        raise SphinxError(
+            f"{len(docnames)} página(s) han cambiado desde el build HTML ({preview}); "
+            "leerlas llamaría a kroki.io. Ejecuta antes scripts/build_book.py."
+        )
+
+
+def build_latex(workspace: Path) -> int:
+    """`jupyter-book build <workspace> --builder latex`, with the two hooks connected."""
+    from jupyter_book import sphinx as jb_sphinx
+
+    class HookedSphinx(jb_sphinx.Sphinx):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self.connect("env-before-read-docs", refuse_reads)
+            self.connect("doctree-resolved", replace_kroki_images)
+
+    original = jb_sphinx.Sphinx
+    jb_sphinx.Sphinx = HookedSphinx
+    try:
+        # The arguments jupyter_book.cli.main.build passes for a book.
+        result = jb_sphinx.build_sphinx(
+            workspace,
+            workspace / "_build" / "latex",
+            noconfig=True,
+            path_config=workspace / "_config.yml",
+            confoverrides={
+                "external_toc_path": (workspace / "_toc.yml").as_posix(),
+                "latex_individualpages": False,
+            },
+            builder="latex",
+        )
+    finally:
+        jb_sphinx.Sphinx = original
+    # build_sphinx has already printed the traceback of a failed build.
+    return 1 if isinstance(result, Exception) else result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build LaTeX reutilizando el entorno Sphinx del build HTML")
+    parser.add_argument("workspace", type=Path, help="Proyecto de build_book.py (.cache/build/<lang>)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        return build_latex(args.workspace.resolve())
+    except Exception as exc:
+        print(f"❌ {type(exc).__name__}: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -92,6 +92,28 @@ def read_preview_state() -> dict[str, object]:
         return {}
 
 
+def print_build_queue(builds: object) -> None:
+    """Summarises the scheduler section of .preview.json (written by preview_book.py)."""
+    if not isinstance(builds, dict):
+        return
+
+    def label(languages: object) -> str:
+        return ", ".join(languages) if isinstance(languages, list) else "libro completo"
+
+    running = builds.get("running")
+    pending = builds.get("pending")
+    last = builds.get("last")
+    if isinstance(running, dict):
+        print(f"   Build: en curso ({label(running.get('languages'))}, {running.get('seconds', 0):.0f}s)")
+    else:
+        print("   Build: en espera de cambios")
+    if isinstance(pending, dict):
+        print(f"   Pendiente: {label(pending.get('languages'))} ({pending.get('changes', 0)} cambio(s))")
+    if isinstance(last, dict):
+        result = "cancelado" if last.get("cancelled") else ("correcto" if last.get("ok") else "falló")
+        print(f"   Último build: {result} en {last.get('build_seconds', 0):.1f}s ({label(last.get('languages'))})")
+
+
 def print_status() -> int:
     pid = read_pid()
     if process_is_running(pid):
@@ -102,6 +124,7 @@ def print_status() -> int:
             print(f"   URL: {url}")
         else:
             print("   URL: arrancando todavía; usa --log si tarda demasiado")
+        print_build_queue(state.get("builds"))
         print(f"   Log: {LOG_FILE}")
         return 0
     print("ℹ️  No hay preview en ejecución.")
@@ -163,6 +186,9 @@ Opciones pasadas a preview_book.py:
   --port 8010       usar otro puerto
   --no-browser      no abrir navegador
   --no-watch        compilar una vez y servir sin vigilar cambios
+  --poll            vigilar cambios por sondeo (si no llegan eventos del disco)
+  --warm            recompilar con un worker Sphinx en caliente por idioma
+  --cancel-stale    cancelar un build en curso si llegan cambios nuevos
 
 Regla: este lanzador NO crea entornos. Si .venv no corresponde al sistema
 actual, se detiene y muestra diagnóstico.
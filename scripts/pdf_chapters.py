@@ -0,0 +1,223 @@
+"""Split, cross-reference and stitch helpers for `export_pdf.py --chapters`.
+
+Sphinx writes the whole book as a single `python.tex`, which one engine
+process compiles on one core. In chapter mode that file is cut into a
+front-matter document (title page + table of contents) and one document per
+top-level `\\part` of `_toc_<lang>.yml` (or per `\\chapter` when the toc has
+no parts). All of them share the original preamble. export_pdf.py compiles
+the pieces in parallel, twice:
+
+1. Every piece starts at page 1 with part/chapter offsets counted in the
+   source. Its .aux yields its labels and its real part/chapter counts.
+2. Every piece reads the labels of all the others (the shared aux pass) and
+   starts at the exact counters and page number implied by pass 1.
+
+The front matter is then compiled against the merged .toc of pass 2, and
+`stitch_pdfs` joins everything with PyMuPDF, rebuilding bookmarks and page
+labels.
+
+This is a draft mode. Links between pieces are not clickable, an index only
+covers the last piece, and a page count that changes between both passes
+(e.g. an extra blank page before a part) shifts later folios.
+"""
+
+import re
+
+CHUNK_JOB_PREFIX = "teachbook-chunk-"
+CONTENTS_BASENAME = "teachbook-contents"
+
+TOC_LINE_RE = re.compile(r"^.*\\(?:sphinx)?tableofcontents\b.*$", re.MULTILINE)
+# Sphinx >= 5.1 emits \sphinxstepscope right before each sectioning command.
+PART_START_RE = re.compile(r"^(?:\\sphinxstepscope\s*)?\\part\{", re.MULTILINE)
+CHAPTER_START_RE = re.compile(r"^(?:\\sphinxstepscope\s*)?\\chapter\{", re.MULTILINE)
+SECTIONING_RE = re.compile(r"^\\(part|chapter)\{", re.MULTILINE)
+PAGESTYLE_RE = re.compile(r"\\pagestyle\{(\w+)\}")
+COUNTERS_RE = re.compile(r"\\teachbookchunkcounters\{(\d+)\}\{(\d+)\}")
+
+BEGIN_DOCUMENT = "\\begin{document}"
+END_DOCUMENT = "\\end{document}"
+# Lets the previous .aux (which holds \teachbookchunkcounters) be read back.
+COUNTERS_PROVIDE = "\\providecommand\\teachbookchunkcounters[2]{}\n"
+COUNTERS_WRITE = (
+    "\\makeatletter\n"
+    "\\AtEndDocument{\\immediate\\write\\@mainaux"
+    "{\\string\\teachbookchunkcounters{\\the\\c@part}{\\the\\c@chapter}}}\n"
+    "\\makeatother\n"
+)
+# The front matter has no sections of its own: read the merged .toc instead.
+CONTENTS_READ = (
+    "\\makeatletter\n"
+    "\\renewcommand{\\@starttoc}[1]{\\begingroup\\makeatletter"
+    f"\\InputIfFileExists{{{CONTENTS_BASENAME}.#1}}{{}}{{}}\\endgroup}}\n"
+    "\\makeatother\n"
+)
+
+
+def split_latex_document(text):
+    """Splits a Sphinx LaTeX document into front matter and top-level pieces.
+
+    Returns a dict with `preamble`, `front`, `pieces` and `pagestyle`, or
+    None when there is no table of contents or fewer than two pieces.
+    """
+    begin = text.find(BEGIN_DOCUMENT)
+    end = text.rfind(END_DOCUMENT)
+    if begin < 0 or end < begin:
+        return None
+    body = text[begin + len(BEGIN_DOCUMENT):end]
+
+    toc_line = TOC_LINE_RE.search(body)
+    if not toc_line:
+        return None
+    rest = body[toc_line.end():]
+
+    pattern = PART_START_RE if PART_START_RE.search(rest) else CHAPTER_START_RE
+    starts = [match.start() for match in pattern.finditer(rest)]
+    if len(starts) < 2:
+        return None
+
+    # Whatever precedes the first part (root page, \pagestyle) stays with it.
+    bounds = [0] + starts[1:] + [len(rest)]
+    styles = PAGESTYLE_RE.findall(rest[:starts[0]])
+    return {
+        "preamble": text[:begin],
+        "front": body[:toc_line.end()],
+        "pieces": [rest[a:b] for a, b in zip(bounds, bounds[1:])],
+        "pagestyle": styles[-1] if styles else None,
+    }
+
+
+def count_sectioning(piece):
+    """Returns how many (parts, chapters) a piece starts, counted in the source."""
+    kinds = SECTIONING_RE.findall(piece)
+    return kinds.count("part"), kinds.count("chapter")
+
+
+def chunk_job_names(split):
+    """Returns (front job name, [piece job names]) for a split document."""
+    names = [f"{CHUNK_JOB_PREFIX}{index:02d}" for index in range(1, len(split["pieces"]) + 1)]
+    return f"{CHUNK_JOB_PREFIX}00", names
+
+
+def piece_document(split, index, page, part, chapter, labels_file=None):
+    """Returns the standalone .tex of piece `index` starting at the given counters."""
+    parts = [
+        split["preamble"],
+        COUNTERS_PROVIDE,
+        BEGIN_DOCUMENT,
+        "\n",
+        COUNTERS_WRITE,
+        "\\pagenumbering{arabic}\n",
+        f"\\setcounter{{page}}{{{page}}}\n",
+        f"\\setcounter{{part}}{{{part}}}\n",
+        f"\\setcounter{{chapter}}{{{chapter}}}\n",
+    ]
+    if split["pagestyle"]:
+        parts.append(f"\\pagestyle{{{split['pagestyle']}}}\n")
+    if labels_file:
+        parts.append(f"\\makeatletter\\InputIfFileExists{{{labels_file}}}{{}}{{}}\\makeatother\n")
+    parts.extend([split["pieces"][index], "\n", END_DOCUMENT, "\n"])
+    return "".join(parts)
+
+
+def front_document(split):
+    """Returns the .tex of the title page and table of contents."""
+    return "".join(
+        [
+            split["preamble"],
+            COUNTERS_PROVIDE,
+            BEGIN_DOCUMENT,
+            "\n",
+            CONTENTS_READ,
+            split["front"],
+            "\n",
+            END_DOCUMENT,
+            "\n",
+        ]
+    )
+
+
+def read_text(path):
+    """Returns the text of a file, or "" if the engine did not leave it."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def read_chunk_counters(aux_path):
+    """Returns the (part, chapter) counters a piece ended with, or None."""
+    matches = COUNTERS_RE.findall(read_text(aux_path))
+    if not matches:
+        return None
+    part, chapter = matches[-1]
+    return int(part), int(chapter)
+
+
+def read_labels(aux_path):
+    """Returns the `\\newlabel` lines of an .aux file."""
+    return [line for line in read_text(aux_path).splitlines() if line.startswith("\\newlabel{")]
+
+
+def write_shared_labels(dest_path, aux_paths):
+    """Writes the labels of several .aux files into one file a piece can \\input."""
+    with open(dest_path, "w", encoding="utf-8", newline="\n") as f:
+        for aux_path in aux_paths:
+            for line in read_labels(aux_path):
+                f.write(line + "\n")
+
+
+def merge_toc_files(toc_paths, dest_path):
+    """Concatenates the .toc files of the pieces, in book order."""
+    with open(dest_path, "w", encoding="utf-8", newline="\n") as f:
+        for toc_path in toc_paths:
+            f.write(read_text(toc_path))
+
+
+def import_pymupdf():
+    """Returns the pymupdf module (`PyMuPDF` in requirements.txt), or None."""
+    try:
+        import pymupdf
+    except ImportError:
+        try:
+            import fitz as pymupdf
+        except ImportError:
+            return None
+    return pymupdf
+
+
+def pdf_page_count(pymupdf, path):
+    """Returns the number of pages of a PDF."""
+    with pymupdf.open(path) as doc:
+        return doc.page_count
+
+
+def stitch_pdfs(pymupdf, pdf_paths, dest_path):
+    """Joins PDFs in order, shifting each one's bookmarks and page labels.
+
+    Every piece was compiled with its final folios, so its own page labels
+    (written by hyperref) are kept as they are, only moved to the new page
+    positions.
+    """
+    stitched = pymupdf.open()
+    bookmarks = []
+    page_labels = []
+    for path in pdf_paths:
+        with pymupdf.open(path) as piece:
+            offset = stitched.page_count
+            for level, title, page in piece.get_toc(simple=True):
+                bookmarks.append([level, title, page + offset if page > 0 else page])
+            for rule in piece.get_page_labels():
+                page_labels.append(dict(rule, startpage=rule["startpage"] + offset))
+            stitched.insert_pdf(piece)
+
+    if bookmarks:
+        try:
+            stitched.set_toc(bookmarks)
+        except ValueError as exc:
+            print(f"   ⚠️ No se pudieron unir los marcadores del PDF: {exc}")
+    if page_labels:
+        stitched.set_page_labels(page_labels)
+    stitched.save(dest_path, garbage=3, deflate=True)
+    stitched.close()
+    return dest_path
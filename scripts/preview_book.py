@@ -20,7 +20,9 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import email.utils
 import functools
+import hashlib
 import http.server
 import io
 import os
@@ -34,8 +36,12 @@ import sys
 import threading
 import time
 import json
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from preview_worker import REPLY_PREFIX
+
 
 # ---------------------------------------------------------------------------
 # UTF-8 output, important on Windows consoles
@@ -54,6 +60,10 @@ if sys.stderr.encoding and sys.stderr.encoding.lower() not in ("utf-8", "utf8"):
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 BOOK_DIR = PROJECT_ROOT / "book"
 BUILD_SCRIPT = PROJECT_ROOT / "scripts" / "build_book.py"
+WORKER_SCRIPT = PROJECT_ROOT / "scripts" / "preview_worker.py"
+# Lines build_book.py prints around its writes into book/_build/html
+PUBLISH_START_MARKER = "📤 Publicando"
+PUBLISH_END_MARKER = "📤 Publicado"
 HTML_DIR = BOOK_DIR / "_build" / "html"
 PID_FILE = PROJECT_ROOT / ".preview.pid"
 STATE_FILE = PROJECT_ROOT / ".preview.json"
@@ -186,27 +196,172 @@ last_build_ok = False
 last_build_started = 0.0
 
 
-def run_real_build(reason: str) -> bool:
-    """Run scripts/build_book.py exactly like production."""
+def book_languages() -> set[str]:
+    """Languages with a _config_<lang>.yml, like build_book.get_languages."""
+    return {path.stem[len("_config_"):] for path in BOOK_DIR.glob("_config_*.yml")}
+
+
+def affected_languages(paths: set[Path]) -> set[str] | None:
+    """Maps changed source paths to the languages to rebuild (None = all).
+
+    `book/<lang>/...` and `_config_<lang>.yml`/`_toc_<lang>.yml` only affect
+    their language. `_static`, root-level bib files, `_config.yml` and
+    anything else is shared by every language.
+    """
+    languages = book_languages()
+    affected: set[str] = set()
+    for path in paths:
+        try:
+            rel = path.resolve().relative_to(BOOK_DIR.resolve())
+        except ValueError:
+            return None
+        if len(rel.parts) > 1 and rel.parts[0] in languages:
+            affected.add(rel.parts[0])
+            continue
+        for prefix in ("_config_", "_toc_"):
+            lang = rel.stem[len(prefix):] if len(rel.parts) == 1 and rel.stem.startswith(prefix) else ""
+            if lang in languages:
+                affected.add(lang)
+                break
+        else:
+            return None
+    return affected or None
+
+
+def run_real_build(reason: str, languages: set[str] | None = None) -> bool:
+    """Run scripts/build_book.py exactly like production.
+
+    With `languages`, only those are rebuilt (`--languages`); the output of
+    the others stays as it is. With --warm, those rebuilds go to the
+    persistent Sphinx workers instead (falling back to build_book.py if a
+    worker is unusable).
+    """
     global last_build_ok, last_build_started
 
-    py = venv_python() or Path(sys.executable)
     started = time.time()
     last_build_started = started
 
     with build_lock:
+        warm = bool(languages) and warm_workers is not None and last_build_ok
         print("\n" + "=" * 72)
-        print(f"🔨 Recompilando libro completo ({reason})")
-        print("   Pipeline real: scripts/build_book.py -> book/_build/html")
+        if languages:
+            print(f"🔨 Recompilando idioma(s) {', '.join(sorted(languages))} ({reason})")
+        else:
+            print(f"🔨 Recompilando libro completo ({reason})")
+        if warm:
+            print("   Workers Sphinx en caliente: scripts/preview_worker.py -> book/_build/html")
+        else:
+            print("   Pipeline real: scripts/build_book.py -> book/_build/html")
         print("=" * 72)
 
+        ok = run_warm_build(languages) if warm and languages else None
+        if ok is None:
+            return_code = run_build_script(languages)
+            ok = return_code == 0
+            failure = f"exit code {return_code}"
+        else:
+            failure = "worker Sphinx"
+        elapsed = time.time() - started
+
+        if build_scheduler is not None and build_scheduler.cancelled():
+            last_build_ok = False
+            print(f"\n⏹️  Build cancelado tras {elapsed:.1f}s: hay cambios más recientes.")
+            return False
+
+        if ok and (HTML_DIR / "index.html").exists():
+            last_build_ok = True
+            print(f"\n✅ Build correcto en {elapsed:.1f}s")
+            print(f"📂 Sirviendo: {HTML_DIR}")
+            announce_build(True)
+            return True
+
+        last_build_ok = False
+        print(f"\n❌ Build falló ({failure}) tras {elapsed:.1f}s")
+        print("   No se abrirá una web vieja como si fuera correcta.")
+        announce_build(False)
+        return False
+
+
+def run_build_script(languages: set[str] | None) -> int:
+    """Runs build_book.py (optionally `--languages`), streaming its output."""
+    py = venv_python() or Path(sys.executable)
+    command = [str(py), str(BUILD_SCRIPT)]
+    if languages:
+        command += ["--languages", ",".join(sorted(languages))]
+
+    env = os.environ.copy()
+    env.setdefault("PYTHONUTF8", "1")
+
+    cancellable = build_scheduler is not None and build_scheduler.cancel_stale
+    process = subprocess.Popen(
+        command,
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        bufsize=1,
+        # Own process group, so a cancel also stops the jupyter-book children.
+        start_new_session=cancellable and os.name != "nt",
+    )
+    if cancellable:
+        assert build_scheduler is not None
+        build_scheduler.attach_process(process)
+
+    try:
+        assert process.stdout is not None
+        for line in process.stdout:
+            print(line, end="")
+            if cancellable and line.startswith((PUBLISH_START_MARKER, PUBLISH_END_MARKER)):
+                assert build_scheduler is not None
+                # Cancelling mid-copy would leave book/_build/html/<lang> partial.
+                build_scheduler.set_publishing(line.startswith(PUBLISH_START_MARKER))
+        return process.wait()
+    finally:
+        if cancellable:
+            assert build_scheduler is not None
+            build_scheduler.attach_process(None)
+
+
+def kill_process_tree(process: subprocess.Popen) -> None:
+    """Stops a build_book.py run together with the jupyter-book processes it started."""
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/PID", str(process.pid), "/T", "/F"], capture_output=True, check=False)
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+    except (OSError, ProcessLookupError):
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Warm Sphinx workers (--warm): one scripts/preview_worker.py per language
+# ---------------------------------------------------------------------------
+
+# None unless --warm; filled lazily by get_warm_worker
+warm_workers: dict[str, WarmWorker] | None = None
+
+
+class WarmWorker:
+    """A preview_worker.py process with Sphinx and one language's extensions loaded."""
+
+    def __init__(self, lang: str) -> None:
+        self.lang = lang
+        self.process: subprocess.Popen | None = None
+
+    def start(self) -> bool:
+        py = venv_python() or Path(sys.executable)
         env = os.environ.copy()
         env.setdefault("PYTHONUTF8", "1")
-
-        process = subprocess.Popen(
-            [str(py), str(BUILD_SCRIPT)],
+        self.process = subprocess.Popen(
+            [str(py), str(WORKER_SCRIPT), self.lang],
             cwd=PROJECT_ROOT,
             env=env,
+            stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             text=True,
@@ -214,30 +369,381 @@ def run_real_build(reason: str) -> bool:
             errors="replace",
             bufsize=1,
         )
+        reply = self.read_reply()
+        return bool(reply and reply.get("ok"))
 
-        assert process.stdout is not None
-        for line in process.stdout:
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def request(self, command: str) -> dict | None:
+        """Sends one command and returns the worker's reply (None if it died)."""
+        if not self.alive():
+            return None
+        assert self.process is not None and self.process.stdin is not None
+        try:
+            self.process.stdin.write(json.dumps({"cmd": command}) + "\n")
+            self.process.stdin.flush()
+        except OSError:
+            return None
+        return self.read_reply()
+
+    def read_reply(self) -> dict | None:
+        assert self.process is not None and self.process.stdout is not None
+        for line in self.process.stdout:
+            if line.startswith(REPLY_PREFIX):
+                return json.loads(line[len(REPLY_PREFIX) :])
             print(line, end="")
+        return None
 
-        return_code = process.wait()
-        elapsed = time.time() - started
+    def stop(self) -> None:
+        if not self.alive():
+            return
+        assert self.process is not None and self.process.stdin is not None
+        try:
+            self.process.stdin.write(json.dumps({"cmd": "stop"}) + "\n")
+            self.process.stdin.flush()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+
+def get_warm_worker(lang: str) -> WarmWorker | None:
+    """Returns a running worker for `lang`, starting (or restarting) it if needed."""
+    assert warm_workers is not None
+    worker = warm_workers.get(lang)
+    if worker is not None and worker.alive():
+        return worker
+    worker = WarmWorker(lang)
+    if not worker.start():
+        print(f"⚠️  No se pudo arrancar el worker Sphinx de '{lang}'.")
+        worker.stop()
+        return None
+    warm_workers[lang] = worker
+    return worker
+
+
+def start_warm_workers() -> None:
+    """Starts every language's worker in the background after the first build."""
+    with build_lock:
+        for lang in sorted(book_languages()):
+            get_warm_worker(lang)
+
+
+def run_warm_build(languages: set[str]) -> bool | None:
+    """Builds `languages` in their workers (in parallel) and publishes them in order.
+
+    Returns None when a worker is unusable, so the caller runs build_book.py.
+    """
+    workers = []
+    for lang in sorted(languages):
+        worker = get_warm_worker(lang)
+        if worker is None:
+            return None
+        workers.append(worker)
+
+    with ThreadPoolExecutor(max_workers=len(workers)) as pool:
+        builds = list(pool.map(lambda worker: worker.request("build"), workers))
+    if any(reply is None for reply in builds):
+        return None
+    failed = [worker.lang for worker, reply in zip(workers, builds) if not reply["ok"]]
+    if failed:
+        print(f"❌ Sphinx falló en: {', '.join(failed)}")
+        return False
 
-        if return_code == 0 and (HTML_DIR / "index.html").exists():
-            last_build_ok = True
-            print(f"\n✅ Build correcto en {elapsed:.1f}s")
-            print(f"📂 Sirviendo: {HTML_DIR}")
-            return True
+    # Publishing writes the shared _static/_images: one language at a time.
+    for worker, build in zip(workers, builds):
+        published = worker.request("publish")
+        if published is None:
+            return None
+        if not published["ok"]:
+            print(f"❌ No se pudo publicar '{worker.lang}': {published.get('error', '')}")
+            return False
+        print(f"   ⚡ {worker.lang}: Sphinx {build['seconds']:.1f}s, publicación {published['seconds']:.1f}s")
+    return True
 
-        last_build_ok = False
-        print(f"\n❌ Build falló (exit code {return_code}) tras {elapsed:.1f}s")
-        print("   No se abrirá una web vieja como si fuera correcta.")
-        return False
+
+# ---------------------------------------------------------------------------
+# Build scheduler: one build at a time plus one pending slot
+# ---------------------------------------------------------------------------
+
+
+def merge_languages(first: set[str] | None, second: set[str] | None) -> set[str] | None:
+    """Union of two rebuild requests, where None (the whole book) absorbs the other."""
+    if first is None or second is None:
+        return None
+    return first | second
+
+
+def languages_label(languages: set[str] | None) -> list[str] | None:
+    return sorted(languages) if languages is not None else None
+
+
+class BuildScheduler:
+    """Runs the watcher's rebuilds one at a time.
+
+    Changes that arrive while a build runs are merged into a single pending
+    slot, which is built as soon as the current build ends, so no edit is
+    lost and a burst of saves costs at most one extra build. With
+    `cancel_stale`, a new change also stops an in-flight build_book.py run
+    and its languages move into the pending slot, unless the run is already
+    publishing into book/_build/html (it then finishes first). Warm worker
+    builds take about a second and are never cancelled.
+    """
+
+    def __init__(self, cancel_stale: bool = False) -> None:
+        self.cancel_stale = cancel_stale
+        self._condition = threading.Condition()
+        self._has_pending = False
+        self._pending: set[str] | None = None
+        self._pending_since = 0.0
+        self._pending_changes = 0
+        self._running: dict | None = None
+        self._process: subprocess.Popen | None = None
+        self._publishing = False
+        self._cancelled = False
+        self.last: dict | None = None
+        self.builds = 0
+        self.cancellations = 0
+        self.merged_changes = 0
+
+    def request(self, languages: set[str] | None) -> None:
+        """Queues a rebuild of `languages` (None = whole book)."""
+        with self._condition:
+            if self._has_pending:
+                self._pending = merge_languages(self._pending, languages)
+                self.merged_changes += 1
+            else:
+                self._has_pending = True
+                self._pending = languages
+                self._pending_since = time.time()
+            self._pending_changes += 1
+
+            if self._running is not None:
+                if self.cancel_stale and self._process is not None and not self._cancelled and not self._publishing:
+                    self._cancelled = True
+                    self.cancellations += 1
+                    self._pending = merge_languages(self._pending, self._running["languages"])
+                    print("⏹️  Cambios nuevos durante el build: se cancela y se vuelve a empezar.")
+                    kill_process_tree(self._process)
+                elif self._pending_changes == 1 and self._publishing:
+                    print("⏳ El build ya está publicando en book/_build/html; el cambio se compilará en cuanto termine.")
+                elif self._pending_changes == 1:
+                    print("⏳ Build en curso; el cambio se compilará en cuanto termine.")
+            self._condition.notify_all()
+        write_preview_state()
+
+    def attach_process(self, process: subprocess.Popen | None) -> None:
+        """Registers the build_book.py process of the current build (for cancelling)."""
+        with self._condition:
+            self._process = process
+            self._publishing = False
+
+    def set_publishing(self, publishing: bool) -> None:
+        """build_book.py started (True) or finished (False) writing book/_build/html."""
+        with self._condition:
+            self._publishing = publishing
+
+    def cancelled(self) -> bool:
+        with self._condition:
+            return self._cancelled
+
+    def stop_current(self) -> None:
+        """Stops the in-flight build_book.py run, if any (preview shutdown)."""
+        with self._condition:
+            if self._process is not None:
+                self._cancelled = True
+                kill_process_tree(self._process)
+
+    def run(self, stop_event: threading.Event) -> None:
+        """Scheduler thread: builds whatever is pending, one build at a time."""
+        while not stop_event.is_set():
+            with self._condition:
+                if not self._condition.wait_for(lambda: self._has_pending, timeout=0.5):
+                    continue
+                languages, changes = self._pending, self._pending_changes
+                waited = time.time() - self._pending_since
+                self._has_pending = False
+                self._pending = None
+                self._pending_changes = 0
+                self._cancelled = False
+                self._running = {"languages": languages, "started": time.time(), "changes": changes}
+            write_preview_state()
+
+            reason = "cambio detectado" if changes == 1 else f"{changes} cambios acumulados"
+            started = time.time()
+            ok = run_real_build(reason, languages)
+
+            with self._condition:
+                self._running = None
+                self.builds += 1
+                self.last = {
+                    "ok": ok,
+                    "cancelled": self._cancelled,
+                    "languages": languages_label(languages),
+                    "changes": changes,
+                    "queued_seconds": round(waited, 3),
+                    "build_seconds": round(time.time() - started, 3),
+                    "finished": time.time(),
+                }
+                self._cancelled = False
+            write_preview_state()
+
+    def snapshot(self) -> dict:
+        """Queue state and timings for .preview.json."""
+        with self._condition:
+            running = None
+            if self._running is not None:
+                running = {
+                    "languages": languages_label(self._running["languages"]),
+                    "changes": self._running["changes"],
+                    "started": self._running["started"],
+                    "seconds": round(time.time() - self._running["started"], 3),
+                }
+            pending = None
+            if self._has_pending:
+                pending = {
+                    "languages": languages_label(self._pending),
+                    "changes": self._pending_changes,
+                    "since": self._pending_since,
+                }
+            return {
+                "state": "building" if running else ("queued" if pending else "idle"),
+                "running": running,
+                "pending": pending,
+                "last": self.last,
+                "builds": self.builds,
+                "cancellations": self.cancellations,
+                "merged_changes": self.merged_changes,
+                "cancel_stale": self.cancel_stale,
+            }
+
+
+# None until the watcher starts (the initial build runs without it)
+build_scheduler: BuildScheduler | None = None
+# pid/port/url written to .preview.json (empty until the server is up)
+preview_state: dict = {}
+state_file_lock = threading.Lock()
+
+
+def write_preview_state() -> None:
+    """Writes .preview.json atomically: launch_preview.py --status reads it at any time."""
+    if not preview_state:
+        return
+    state = dict(preview_state)
+    if build_scheduler is not None:
+        state["builds"] = build_scheduler.snapshot()
+    with state_file_lock:
+        tmp_path = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+            os.replace(tmp_path, STATE_FILE)
+        except OSError as exc:
+            print(f"⚠️  No se pudo escribir {STATE_FILE.name}: {exc}")
+
+
+# ---------------------------------------------------------------------------
+# Live reload: which output files each build changed, pushed over SSE
+# ---------------------------------------------------------------------------
+
+# Rewritten on every build although pages did not change visibly
+RELOAD_IGNORED_FILE_NAMES = {"searchindex.js", "objects.inv", ".buildinfo", "languages.json"}
+
+
+class BuildEvents:
+    """Finished builds, published to the Server-Sent Events clients."""
+
+    def __init__(self, keep: int = 20) -> None:
+        self._condition = threading.Condition()
+        self._events: list[dict] = []
+        self._keep = keep
+        self.last_build = 0
+
+    def publish(self, payload: dict) -> dict:
+        with self._condition:
+            self.last_build += 1
+            payload = dict(payload, build=self.last_build)
+            self._events = (self._events + [payload])[-self._keep :]
+            self._condition.notify_all()
+            return payload
+
+    def wait_after(self, build: int, timeout: float) -> list[dict]:
+        """Returns the events newer than `build`, waiting up to `timeout` s for one."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.last_build > build, timeout=timeout)
+            return [event for event in self._events if event["build"] > build]
+
+
+build_events = BuildEvents()
+# rel path -> (size, mtime_ns, sha256) of every file in book/_build/html
+output_state: dict[str, tuple[int, int, str]] = {}
+
+
+def scan_output(previous: dict[str, tuple[int, int, str]]) -> dict[str, tuple[int, int, str]]:
+    """Hashes book/_build/html, reusing the hash of files whose size/mtime held."""
+    state: dict[str, tuple[int, int, str]] = {}
+    for path in HTML_DIR.rglob("*"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if not path.is_file():
+            continue
+        rel = path.relative_to(HTML_DIR).as_posix()
+        old = previous.get(rel)
+        if old and old[0] == stat.st_size and old[1] == stat.st_mtime_ns:
+            state[rel] = old
+            continue
+        try:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            continue
+        state[rel] = (stat.st_size, stat.st_mtime_ns, digest)
+    return state
+
+
+def announce_build(ok: bool) -> None:
+    """Tells the open pages that a build finished and which pages changed."""
+    global output_state
+
+    if not ok:
+        build_events.publish({"ok": False, "pages": [], "reload_all": False})
+        return
+
+    previous = output_state
+    output_state = scan_output(previous)
+    if not previous:
+        # Initial build: nothing is open yet.
+        return
+
+    changed = {
+        rel
+        for rel in set(previous) | set(output_state)
+        if (previous.get(rel) or (0, 0, ""))[2] != (output_state.get(rel) or (0, 0, ""))[2]
+    }
+    pages = sorted("/" + rel for rel in changed if rel.endswith(".html"))
+    assets = sorted(
+        rel
+        for rel in changed
+        if not rel.endswith(".html") and rel.rsplit("/", 1)[-1] not in RELOAD_IGNORED_FILE_NAMES
+    )
+    event = build_events.publish({"ok": True, "pages": pages, "reload_all": bool(assets)})
+    if assets:
+        print(f"🔁 Build {event['build']}: cambiaron recursos compartidos; se recargan todas las páginas abiertas.")
+    else:
+        print(f"🔁 Build {event['build']}: {len(pages)} página(s) cambiada(s).")
 
 
 # ---------------------------------------------------------------------------
-# File watching by polling (portable; no extra watcher magic)
+# File watching: filesystem events (watchdog), polling as fallback
 # ---------------------------------------------------------------------------
 
+# Quiet time after the last change before rebuilding (editors save in bursts)
+EVENT_DEBOUNCE_SECONDS = 0.5
+POLL_INTERVAL_SECONDS = 2.0
+# watchdog >= 4 also reports reads ("opened", "closed_no_write"); the build
+# itself reads every source, so only events that change content count.
+CONTENT_EVENT_TYPES = {"created", "modified", "moved", "deleted", "closed"}
+
 
 def is_watchable(path: Path) -> bool:
     if path.name in IGNORED_FILE_NAMES:
@@ -250,6 +756,77 @@ def is_watchable(path: Path) -> bool:
     return True
 
 
+class PendingChanges:
+    """Changed source paths reported by a watcher, waiting for a quiet period."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._paths: set[Path] = set()
+        self._last_change = 0.0
+
+    def add(self, paths: set[Path]) -> None:
+        if not paths:
+            return
+        with self._lock:
+            if not self._paths:
+                print("\n📝 Cambio detectado. Esperando a que termine de guardar...")
+            self._paths.update(paths)
+            self._last_change = time.monotonic()
+
+    def take_if_quiet(self, quiet: float) -> set[Path]:
+        """Returns (and clears) the pending paths once nothing changed for `quiet` s."""
+        with self._lock:
+            if not self._paths or time.monotonic() - self._last_change < quiet:
+                return set()
+            paths, self._paths = self._paths, set()
+            return paths
+
+
+class BookEventHandler:
+    """watchdog handler (duck-typed `dispatch`) feeding PendingChanges."""
+
+    def __init__(self, changes: PendingChanges) -> None:
+        self.changes = changes
+
+    def dispatch(self, event: object) -> None:
+        if getattr(event, "is_directory", False):
+            return
+        if getattr(event, "event_type", "") not in CONTENT_EVENT_TYPES:
+            return
+        paths = set()
+        for raw in (getattr(event, "src_path", ""), getattr(event, "dest_path", "")):
+            if raw:
+                path = Path(os.fsdecode(raw))
+                if is_watchable(path):
+                    paths.add(path)
+        self.changes.add(paths)
+
+
+def start_event_observer(changes: PendingChanges) -> object | None:
+    """Starts a watchdog observer on book/, or returns None if events are unavailable."""
+    try:
+        from watchdog.observers import Observer
+    except ImportError:
+        print("ℹ️  watchdog no está instalado; se vigilan cambios por sondeo.")
+        return None
+
+    observer = Observer()
+    try:
+        observer.schedule(BookEventHandler(changes), str(BOOK_DIR), recursive=True)
+        observer.daemon = True
+        observer.start()
+    except Exception as exc:
+        # e.g. inotify watch limit reached, or a filesystem without events
+        print(f"ℹ️  No se pueden recibir eventos del sistema de archivos ({exc}); se usa sondeo.")
+        return None
+    return observer
+
+
+def events_are_reliable() -> bool:
+    """False where file events do not arrive (Windows drives mounted in WSL)."""
+    return not (is_wsl() and str(PROJECT_ROOT).startswith("/mnt/"))
+
+
 def snapshot_sources() -> dict[str, float]:
     snapshot: dict[str, float] = {}
     if not BOOK_DIR.exists():
@@ -264,41 +841,173 @@ def snapshot_sources() -> dict[str, float]:
     return snapshot
 
 
-def watcher_loop(stop_event: threading.Event, interval: float = 2.0) -> None:
+def polling_loop(stop_event: threading.Event, changes: PendingChanges, interval: float = POLL_INTERVAL_SECONDS) -> None:
+    """Fallback watcher: diff a full snapshot of book/ every `interval` seconds."""
     previous = snapshot_sources()
-    pending_since: float | None = None
 
-    while not stop_event.is_set():
-        time.sleep(interval)
+    while not stop_event.wait(interval):
         current = snapshot_sources()
-
         if current != previous:
+            changed = {
+                Path(path)
+                for path in set(current) | set(previous)
+                if current.get(path) != previous.get(path)
+            }
             previous = current
-            pending_since = time.time()
-            print("\n📝 Cambio detectado. Esperando a que termine de guardar...")
-            continue
+            changes.add(changed)
+
+
+def watcher_loop(stop_event: threading.Event, changes: PendingChanges, quiet: float) -> None:
+    assert build_scheduler is not None
+    while not stop_event.wait(0.2):
+        changed = changes.take_if_quiet(quiet)
+        if changed:
+            build_scheduler.request(affected_languages(changed))
+
 
-        # debounce: only rebuild once files have been stable for ~2 seconds
-        if pending_since and time.time() - pending_since >= 2.0:
-            pending_since = None
-            if build_lock.locked():
-                print("⏳ Build en curso; se recompilará en el siguiente cambio estable.")
-                continue
-            run_real_build("cambio detectado")
+def start_watching(stop_event: threading.Event, force_polling: bool, cancel_stale: bool = False) -> object | None:
+    """Starts the watcher and scheduler threads; returns the watchdog observer, if any."""
+    global build_scheduler
+
+    build_scheduler = BuildScheduler(cancel_stale)
+    threading.Thread(target=build_scheduler.run, args=(stop_event,), daemon=True).start()
+    changes = PendingChanges()
+    observer = None
+    if not force_polling and events_are_reliable():
+        observer = start_event_observer(changes)
+
+    if observer is not None:
+        print("👀 Vigilando book/ con eventos del sistema de archivos.")
+        quiet = EVENT_DEBOUNCE_SECONDS
+    else:
+        print(f"👀 Vigilando book/ por sondeo cada {POLL_INTERVAL_SECONDS:.0f}s.")
+        threading.Thread(target=polling_loop, args=(stop_event, changes), daemon=True).start()
+        # like before: rebuild once files have been stable for one more poll
+        quiet = POLL_INTERVAL_SECONDS
+
+    threading.Thread(target=watcher_loop, args=(stop_event, changes, quiet), daemon=True).start()
+    return observer
 
 
 # ---------------------------------------------------------------------------
-# Static HTTP server with no-cache headers
+# Static HTTP server: revalidated caching + live-reload endpoints
 # ---------------------------------------------------------------------------
 
+EVENTS_PATH = "/__preview__/events"
+CLIENT_PATH = "/__preview__/client.js"
+CLIENT_TAG = f'<script src="{CLIENT_PATH}"></script>'.encode("utf-8")
+SSE_HEARTBEAT_SECONDS = 15.0
+
+# Reloads the page only when the build it is told about changed it.
+CLIENT_JS = f"""(function () {{
+  if (!window.EventSource) return;
+  var page = decodeURIComponent(location.pathname);
+  if (page.endsWith("/")) page += "index.html";
+  var source = new EventSource("{EVENTS_PATH}");
+  source.addEventListener("build", function (event) {{
+    var build = JSON.parse(event.data);
+    if (!build.ok) {{
+      console.warn("[preview] El build " + build.build + " falló; se mantiene la página actual.");
+      return;
+    }}
+    if (build.reload_all || build.pages.indexOf(page) !== -1) location.reload();
+  }});
+}})();
+""".encode("utf-8")
+
+
+class PreviewHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves book/_build/html with validators instead of `no-store`.
+
+    Every response may be cached but must be revalidated (`no-cache`), so an
+    unchanged asset costs a 304. Theme files with a `?digest=`/`?v=` query
+    are immutable. HTML pages get the live-reload client injected and an
+    ETag built from mtime_ns/size, since two builds can land in the same
+    second of Last-Modified.
+    """
+
+    def do_GET(self) -> None:
+        route = self.path.split("?", 1)[0]
+        if route == EVENTS_PATH:
+            self.stream_build_events()
+            return
+        if route == CLIENT_PATH:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/javascript; charset=utf-8")
+            self.send_header("Content-Length", str(len(CLIENT_JS)))
+            self.end_headers()
+            self.wfile.write(CLIENT_JS)
+            return
+        super().do_GET()
 
-class NoCacheHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def end_headers(self) -> None:
-        self.send_header("Cache-Control", "no-store, no-cache, must-revalidate, max-age=0")
-        self.send_header("Pragma", "no-cache")
-        self.send_header("Expires", "0")
+        # Sphinx versions static assets as `?v=<hash>` (`?digest=` in the theme).
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        if "v" in query or "digest" in query:
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        else:
+            self.send_header("Cache-Control", "no-cache")
         super().end_headers()
 
+    def send_head(self):  # type: ignore[no-untyped-def]
+        path = Path(self.translate_path(self.path))
+        if path.is_dir() and self.path.split("?", 1)[0].endswith("/"):
+            path = path / "index.html"
+        if path.suffix == ".html" and path.is_file():
+            return self.send_html_with_client(path)
+        return super().send_head()
+
+    def send_html_with_client(self, path: Path) -> io.BytesIO | None:
+        try:
+            stat = path.stat()
+            body = path.read_bytes()
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return None
+
+        index = body.lower().rfind(b"</body>")
+        body = body[:index] + CLIENT_TAG + body[index:] if index >= 0 else body + CLIENT_TAG
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", email.utils.formatdate(stat.st_mtime, usegmt=True))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def stream_build_events(self) -> None:
+        """Server-Sent Events: one `build` event per finished build."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+
+        try:
+            last_seen = int(self.headers.get("Last-Event-ID", ""))
+        except ValueError:
+            last_seen = build_events.last_build
+        try:
+            self.wfile.write(b"retry: 1000\n\n")
+            self.wfile.flush()
+            while True:
+                events = build_events.wait_after(last_seen, SSE_HEARTBEAT_SECONDS)
+                if not events:
+                    self.wfile.write(b": ping\n\n")
+                for event in events:
+                    last_seen = event["build"]
+                    data = json.dumps(event, ensure_ascii=False)
+                    self.wfile.write(f"id: {last_seen}\nevent: build\ndata: {data}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            return
+
     def log_message(self, format: str, *args: object) -> None:
         # Keep output teacher-friendly; no noisy request logs.
         return
@@ -310,7 +1019,7 @@ class ReusableTCPServer(socketserver.ThreadingTCPServer):
 
 
 def start_server(port: int) -> ReusableTCPServer:
-    handler = functools.partial(NoCacheHTTPRequestHandler, directory=str(HTML_DIR))
+    handler = functools.partial(PreviewHTTPRequestHandler, directory=str(HTML_DIR))
     server = ReusableTCPServer(("127.0.0.1", port), handler)
     thread = threading.Thread(target=server.serve_forever, daemon=True)
     thread.start()
@@ -327,10 +1036,27 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--port", type=int, default=8000, help="Puerto local (por defecto: 8000)")
     parser.add_argument("--no-browser", action="store_true", help="No abrir el navegador automáticamente")
     parser.add_argument("--no-watch", action="store_true", help="Compilar una vez y servir sin vigilar cambios")
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="Mantener un worker Sphinx por idioma y recompilar en caliente solo lo cambiado",
+    )
+    parser.add_argument(
+        "--cancel-stale",
+        action="store_true",
+        help="Cancelar un build de build_book.py en curso si llegan cambios nuevos",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Vigilar cambios por sondeo en vez de eventos (discos de red, /mnt/c en WSL)",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
+    global warm_workers
+
     args = parse_args()
 
     print("\n📘 TeachBook Live Preview")
@@ -350,28 +1076,28 @@ def main() -> int:
 
     server = start_server(port)
     stop_event = threading.Event()
-    STATE_FILE.write_text(
-        json.dumps(
-            {
-                "pid": os.getpid(),
-                "port": port,
-                "url": f"http://127.0.0.1:{port}",
-                "html_dir": str(HTML_DIR),
-            },
-            indent=2,
-        ),
-        encoding="utf-8",
+    preview_state.update(
+        {
+            "pid": os.getpid(),
+            "port": port,
+            "url": f"http://127.0.0.1:{port}",
+            "html_dir": str(HTML_DIR),
+        }
     )
+    write_preview_state()
 
-    watcher_thread: threading.Thread | None = None
+    observer = None
     if not args.no_watch:
-        watcher_thread = threading.Thread(target=watcher_loop, args=(stop_event,), daemon=True)
-        watcher_thread.start()
+        observer = start_watching(stop_event, args.poll, args.cancel_stale)
+        write_preview_state()
+        if args.warm:
+            warm_workers = {}
+            threading.Thread(target=start_warm_workers, daemon=True).start()
 
     url = f"http://localhost:{port}"
     print("\n" + "=" * 72)
     print(f"🌐 Preview listo: {url}")
-    print("   Si ves algo viejo: Ctrl+F5. El servidor manda cabeceras no-cache.")
+    print("   Las páginas abiertas se recargan solas cuando un build las cambia.")
     print("   Pulsa Ctrl+C para detener.")
     print("=" * 72 + "\n")
 
@@ -381,6 +1107,12 @@ def main() -> int:
     def shutdown(_signum: int | None = None, _frame: object | None = None) -> None:
         print("\n🛑 Deteniendo preview...")
         stop_event.set()
+        if observer is not None:
+            observer.stop()
+        if build_scheduler is not None:
+            build_scheduler.stop_current()
+        for worker in (warm_workers or {}).values():
+            worker.stop()
         server.shutdown()
         server.server_close()
         try:
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Warm Sphinx build worker for one language of the live preview.
+
+`preview_book.py --warm` starts one of these per language. The worker
+imports Sphinx, MyST, the theme and every extension once, then serves
+rebuild requests from stdin (one JSON object per line):
+
+    {"cmd": "build"}    sync book/<lang> into .cache/build/<lang>, incremental build
+    {"cmd": "publish"}  copy the result into book/_build/html (build_book.py steps)
+    {"cmd": "stop"}
+
+Each request gets one reply line on stdout prefixed with REPLY_PREFIX; every
+other line is build output for the preview console. `build` and `publish`
+are separate so the preview can build several languages at once but publish
+them one at a time, like build_book.py does.
+
+The project is the same `.cache/build/<lang>` that build_book.py uses, and
+every build runs jupyter-book's own `build_sphinx` with the arguments of
+`jupyter-book build`, so the pages are the same. Sphinx applications are
+single-use: each build creates a new one, which loads the pickled
+environment from disk. That also picks up a full build_book.py run or a
+changed `_config_<lang>.yml`/`_toc_<lang>.yml` without any extra step.
+
+Usage (normally only through preview_book.py):
+    python scripts/preview_worker.py es
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BOOK_DIR = PROJECT_ROOT / "book"
+REPLY_PREFIX = "@@teachbook-preview-worker "
+
+
+def reply(payload: dict) -> None:
+    sys.stdout.write(REPLY_PREFIX + json.dumps(payload) + "\n")
+    sys.stdout.flush()
+
+
+class WarmSphinxBuild:
+    """Incremental HTML builds of one language with the Python modules kept loaded."""
+
+    def __init__(self, lang: str, verbose: bool = False) -> None:
+        # build_book.py resolves book/ and .cache/ against the working directory.
+        os.chdir(PROJECT_ROOT)
+        import build_book
+
+        self.build_book = build_book
+        self.lang = lang
+        self.verbose = verbose
+        self.workspace: Path | None = None
+
+    def load(self) -> None:
+        """Imports Sphinx, jupyter-book and the book's extensions before the first request."""
+        import importlib
+
+        from jupyter_book.config import get_final_config
+
+        print(f"🔥 [{self.lang}] Cargando Sphinx y las extensiones del libro...")
+        workspace = Path(self.build_book.get_standalone_build_root(self.lang))
+        if not (workspace / "_config.yml").is_file():
+            return
+        sphinx_config, _config_meta = get_final_config(
+            user_yaml=workspace / "_config.yml",
+            cli_config={
+                "external_toc_path": (workspace / "_toc.yml").as_posix(),
+                "latex_individualpages": False,
+            },
+            sourcedir=workspace,
+            use_external_toc=True,
+        )
+        for extension in sphinx_config.get("extensions", []):
+            try:
+                importlib.import_module(extension)
+            except ImportError:
+                # The build itself reports it, with Sphinx's own message.
+                pass
+
+    def build(self) -> dict:
+        from jupyter_book.sphinx import build_sphinx
+
+        started = time.perf_counter()
+        workspace = self.build_book.prepare_standalone_project(self.lang)
+        if not workspace:
+            return {"ok": False, "error": f"book/{self.lang} no existe"}
+        self.workspace = Path(workspace)
+
+        # The arguments jupyter_book.cli.main.build passes for a book. Only
+        # the files sync_tree really changed have new mtimes, so Sphinx
+        # re-reads and re-writes just those pages.
+        result = build_sphinx(
+            self.workspace,
+            self.workspace / "_build" / "html",
+            noconfig=True,
+            path_config=self.workspace / "_config.yml",
+            confoverrides={
+                "external_toc_path": (self.workspace / "_toc.yml").as_posix(),
+                "latex_individualpages": False,
+            },
+            builder="html",
+            quiet=not self.verbose,
+        )
+        seconds = round(time.perf_counter() - started, 3)
+        if isinstance(result, Exception):
+            # build_sphinx has already printed the traceback.
+            return {"ok": False, "error": "excepción en Sphinx", "seconds": seconds}
+        return {"ok": result == 0, "status": result, "seconds": seconds}
+
+    def publish(self) -> dict:
+        if self.workspace is None:
+            return {"ok": False, "error": "no hay build que publicar"}
+        started = time.perf_counter()
+        self.build_book.publish_standalone_build(self.lang, str(self.workspace))
+        final_static = os.path.join(self.build_book.FINAL_HTML_DIR, "_static")
+        self.build_book.copy_languages_json_to_language(self.lang, final_static)
+        return {"ok": True, "seconds": round(time.perf_counter() - started, 3)}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Worker Sphinx persistente para la preview")
+    parser.add_argument("lang", help="Idioma a compilar (book/<lang>)")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar toda la salida de Sphinx")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        worker = WarmSphinxBuild(args.lang, verbose=args.verbose)
+    except Exception as exc:
+        reply({"ok": False, "error": f"{type(exc).__name__}: {exc}"})
+        return 1
+    try:
+        worker.load()
+    except Exception:
+        # Not fatal: the first build imports whatever is still missing.
+        traceback.print_exc(file=sys.stdout)
+    reply({"ok": True, "ready": True})
+
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        command = request.get("cmd")
+        if command == "stop":
+            break
+        if command == "build":
+            reply(worker.build())
+        elif command == "publish":
+            try:
+                reply(worker.publish())
+            except Exception as exc:
+                traceback.print_exc(file=sys.stdout)
+                reply({"ok": False, "error": f"{type(exc).__name__}: {exc}"})
+        else:
+            reply({"ok": False, "error": f"orden desconocida: {command}"})
+        # build_book's TIMER keeps a record per phase; nobody reports them here.
+        worker.build_book.TIMER.drain()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
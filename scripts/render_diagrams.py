@@ -19,17 +19,27 @@ Generated files are written to::
 
     book/_static/generated/diagrams/<lang>/<name>.svg
 
-By default existing outputs are kept. Use ``--force`` to re-render everything.
+Each output is recorded in ``manifest.json`` with a hash of its source, type,
+format and renderer, so only diagrams whose source changed are rendered
+again. Rendered bytes are also kept in ``.cache/diagrams/<hash>.<format>``;
+after switching branches, outputs are restored from there without calling
+Kroki. Use ``--force`` to re-render everything.
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import importlib.util
 import json
+import os
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -38,12 +48,22 @@ try:
 except ImportError:  # pragma: no cover - handled for user-friendly diagnostics
     requests = None  # type: ignore[assignment]
 
+try:
+    # Optional: with httpx + h2 installed, Kroki is called over HTTP/2.
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_SOURCE_DIR = PROJECT_ROOT / "diagram_sources"
 DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "book" / "_static" / "generated" / "diagrams"
 DEFAULT_PDF_FALLBACK_DIR = PROJECT_ROOT / "book" / "_static" / "generated" / "diagrams_pdf"
 DEFAULT_KROKI_URL = "https://kroki.io/"
+DEFAULT_CACHE_DIR = PROJECT_ROOT / ".cache" / "diagrams"
+DEFAULT_WORKERS = 1
+# Bump when a renderer change should invalidate every cached diagram.
+RENDER_CACHE_VERSION = 1
 
 EXTENSION_TO_KROKI_TYPE = {
     ".mermaid": "mermaid",
@@ -114,17 +134,30 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--mermaid-renderer",
-        choices=("auto", "mmdc", "kroki"),
+        choices=("auto", "browser", "mmdc", "kroki"),
         default="auto",
         help=(
             "Renderer for Mermaid sources. 'auto' prefers local Mermaid CLI "
-            "when available and falls back to Kroki."
+            "and falls back to Kroki. 'browser' (opt-in) renders every Mermaid "
+            "diagram in one headless Chromium (Playwright) with a local mermaid.js."
         ),
     )
+    parser.add_argument(
+        "--mermaid-js",
+        type=Path,
+        default=None,
+        help="mermaid.min.js for the 'browser' renderer (default: node_modules or the Mermaid CLI install).",
+    )
     parser.add_argument(
         "--force",
         action="store_true",
-        help="Re-render even when the output file already exists.",
+        help="Re-render everything, ignoring recorded hashes and the render cache.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Content-addressed cache of rendered diagrams (default: .cache/diagrams/).",
     )
     parser.add_argument(
         "--dry-run",
@@ -149,6 +182,26 @@ def parse_args() -> argparse.Namespace:
         default=3,
         help="Stop after this many failed diagrams (default: 3). Use 0 to never stop early.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=(
+            "Diagrams rendered at the same time (default: 1, one by one). "
+            "Raise it only for a Kroki instance that can take the load."
+        ),
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=0,
+        help="Keep-alive HTTP connections kept open to Kroki (default: same as --workers).",
+    )
+    parser.add_argument(
+        "--no-http2",
+        action="store_true",
+        help="Do not use HTTP/2 even when httpx and h2 are installed.",
+    )
     return parser.parse_args()
 
 
@@ -177,6 +230,48 @@ def discover_jobs(source_dir: Path, output_dir: Path, output_format: str) -> lis
     return jobs
 
 
+def create_http_client(pool_size: int, http2: bool = True):
+    """Return a keep-alive HTTP client shared by every render thread.
+
+    Reusing one client means each Kroki request reuses an open TCP/TLS
+    connection instead of paying a new handshake. Uses an HTTP/2 `httpx`
+    client when httpx and h2 are installed (and `http2` is True); otherwise a
+    `requests.Session` with a pool of `pool_size` connections. Returns None if
+    neither library is available.
+    """
+    pool_size = max(1, pool_size)
+    if http2 and httpx is not None:
+        try:
+            return httpx.Client(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                ),
+                follow_redirects=True,
+            )
+        except ImportError:
+            # httpx is installed without the optional h2 package.
+            pass
+    if requests is None:
+        return None
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def post_to_kroki(client, url: str, timeout: int, body: bytes | None = None, **kwargs):
+    """POST with either an httpx client or a requests session/module."""
+    if body is not None:
+        body_arg = "content" if httpx is not None and isinstance(client, httpx.Client) else "data"
+        kwargs[body_arg] = body
+    return client.post(url, timeout=timeout, **kwargs)
+
+
 def render_job(
     job: DiagramJob,
     kroki_url: str,
@@ -184,12 +279,19 @@ def render_job(
     retries: int,
     request_mode: str,
     mermaid_renderer: str = "auto",
-) -> None:
-    if job.diagram_type == "mermaid" and mermaid_renderer in ("auto", "mmdc"):
-        if render_mermaid_with_mmdc(job, mermaid_renderer):
-            return
-
-    if requests is None:
+    client=None,
+) -> str:
+    """Render one job; returns the renderer that produced it ("mmdc" or "kroki")."""
+    if job.diagram_type == "mermaid" and mermaid_renderer in ("auto", "browser", "mmdc"):
+        # Diagrams the batch browser renderer could not handle fall back to
+        # Mermaid CLI (when installed) or Kroki.
+        strict = "mmdc" if mermaid_renderer == "mmdc" else "auto"
+        if render_mermaid_with_mmdc(job, strict):
+            return "mmdc"
+
+    if client is None:
+        client = requests
+    if client is None:
         raise RuntimeError(
             "No se puede importar 'requests'. Ejecuta el script con el Python de .venv."
         )
@@ -206,21 +308,22 @@ def render_job(
                     "diagram_type": job.diagram_type,
                     "output_format": job.output_format,
                 }
-                response = requests.post(base_url + "/", json=payload, timeout=timeout)
+                response = post_to_kroki(client, base_url + "/", timeout, json=payload)
             else:
-                response = requests.post(
+                response = post_to_kroki(
+                    client,
                     f"{base_url}/{job.diagram_type}/{job.output_format}",
-                    data=diagram_source.encode("utf-8"),
+                    timeout,
+                    body=diagram_source.encode("utf-8"),
                     headers={
                         "Content-Type": "text/plain; charset=utf-8",
                         "Accept": f"image/{job.output_format}",
                     },
-                    timeout=timeout,
                 )
             response.raise_for_status()
             job.output.parent.mkdir(parents=True, exist_ok=True)
             job.output.write_bytes(response.content)
-            return
+            return "kroki"
         except Exception as exc:  # requests exposes several exception classes
             last_error = exc
             if attempt < retries:
@@ -260,18 +363,158 @@ def render_mermaid_with_mmdc(job: DiagramJob, mermaid_renderer: str) -> bool:
     return True
 
 
-def maybe_render_pdf_fallback_png(
-    job: DiagramJob,
-    source_dir: Path,
-    pdf_fallback_dir: Path,
-    kroki_url: str,
-    timeout: int,
-    retries: int,
-    request_mode: str,
-    mermaid_renderer: str,
-    force: bool,
-) -> None:
-    """Render a PDF-only PNG sidecar for Mermaid SVG diagrams.
+def find_mermaid_js(explicit: Path | None) -> Path | None:
+    """Locate a local mermaid.min.js for the browser renderer.
+
+    Order: --mermaid-js, a local node_modules, and the copy bundled with a
+    global Mermaid CLI install. Nothing is downloaded: the script that ends
+    up executed is always one installed (and versioned) on this machine.
+    """
+    if explicit is not None:
+        return explicit if explicit.is_file() else None
+
+    candidates = [PROJECT_ROOT / "node_modules" / "mermaid" / "dist" / "mermaid.min.js"]
+    npm = shutil.which("npm")
+    if npm:
+        result = subprocess.run([npm, "root", "-g"], capture_output=True, text=True)
+        if result.returncode == 0 and result.stdout.strip():
+            npm_root = Path(result.stdout.strip())
+            candidates.append(
+                npm_root / "@mermaid-js" / "mermaid-cli" / "node_modules" / "mermaid" / "dist" / "mermaid.min.js"
+            )
+            candidates.append(npm_root / "mermaid" / "dist" / "mermaid.min.js")
+
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def resolve_mermaid_renderer(args: argparse.Namespace) -> tuple[str, Path | None]:
+    """Turn --mermaid-renderer into the renderer actually used: browser, mmdc or kroki.
+
+    Returns (renderer, mermaid_js). 'auto' prefers Mermaid CLI, then Kroki;
+    the batch browser renderer (Playwright + mermaid.js) is only used when
+    requested explicitly, since its output differs slightly from mmdc's.
+    """
+    requested = args.mermaid_renderer
+    if requested == "browser":
+        mermaid_js = None
+        if importlib.util.find_spec("playwright") is not None:
+            mermaid_js = find_mermaid_js(args.mermaid_js)
+        if mermaid_js is None:
+            raise RuntimeError(
+                "El renderizador 'browser' necesita Playwright (pip install playwright && "
+                "playwright install chromium) y un mermaid.min.js local (--mermaid-js, "
+                "npm install mermaid o Mermaid CLI instalado)."
+            )
+        return "browser", mermaid_js
+    if requested in ("auto", "mmdc"):
+        if requested == "mmdc" or shutil.which("mmdc") or shutil.which("npx"):
+            return "mmdc", None
+    return "kroki", None
+
+
+@functools.lru_cache(maxsize=None)
+def mermaid_cli_label() -> str:
+    """`mermaid-cli:<mmdc --version>`, resolved once per run.
+
+    Without a local mmdc, `npx` runs whatever Mermaid CLI it resolves, which
+    has no version to record.
+    """
+    mmdc = shutil.which("mmdc")
+    if not mmdc:
+        return "mermaid-cli:npx"
+    try:
+        result = subprocess.run([mmdc, "--version"], capture_output=True, text=True, timeout=60)
+        version = result.stdout.strip().splitlines()[0] if result.stdout.strip() else ""
+    except (OSError, subprocess.SubprocessError):
+        version = ""
+    return f"mermaid-cli:{version or 'unknown'}"
+
+
+def mermaid_renderer_label(renderer: str, mermaid_js: Path | None) -> str:
+    """Renderer identity stored in the cache key of Mermaid diagrams."""
+    if renderer == "browser" and mermaid_js is not None:
+        return "mermaid-browser:" + hashlib.sha256(mermaid_js.read_bytes()).hexdigest()[:16]
+    if renderer == "mmdc":
+        return mermaid_cli_label()
+    return "kroki"
+
+
+def mermaid_element_id(source_text: str) -> str:
+    """Id passed to `mermaid.render`, which embeds it in the SVG's styles.
+
+    Derived from the diagram source (the bytes the cache key hashes), so a
+    diagram renders to the same SVG whatever other diagrams are in the batch.
+    """
+    return "diagram-" + hashlib.sha256(source_text.encode("utf-8")).hexdigest()[:16]
+
+
+def render_mermaid_batch(targets: list[DiagramJob], mermaid_js: Path) -> set[Path]:
+    """Render Mermaid jobs through one headless Chromium page.
+
+    mmdc starts Node and a new browser for every file (and again for the PNG
+    fallback). Here a single page loads mermaid.js once; each source is laid
+    out once with `mermaid.render`, the SVG is written as is, and PNG targets
+    are screenshots of that same SVG (2x scale, white background, like
+    `mmdc -s 2 -b white`). Returns the outputs written; anything missing is
+    left for the per-job fallback (Mermaid CLI or Kroki).
+    """
+    from playwright.sync_api import Error as PlaywrightError
+    from playwright.sync_api import sync_playwright
+
+    by_source: dict[Path, list[DiagramJob]] = {}
+    for target in targets:
+        if target.output_format in ("svg", "png"):
+            by_source.setdefault(target.source, []).append(target)
+    if not by_source:
+        return set()
+
+    written: set[Path] = set()
+    print(f"🧜 Renderizando {len(by_source)} diagramas Mermaid con un único navegador...")
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        try:
+            # Mermaid SVGs use width="100%" capped by a max-width at their
+            # natural size, so a wide viewport keeps PNGs at 1:1 (x2).
+            page = browser.new_page(
+                viewport={"width": 4096, "height": 2048}, device_scale_factor=2
+            )
+            page.set_content(
+                "<!DOCTYPE html><html><body style=\"margin:0;background:white\">"
+                "<div id=\"diagram\"></div></body></html>"
+            )
+            page.add_script_tag(path=str(mermaid_js))
+            page.evaluate("() => mermaid.initialize({ startOnLoad: false })")
+
+            for source, source_targets in by_source.items():
+                try:
+                    code = source.read_text(encoding="utf-8")
+                    svg = page.evaluate(
+                        "async ([id, code]) => (await mermaid.render(id, code)).svg",
+                        [mermaid_element_id(code), code],
+                    )
+                    for target in source_targets:
+                        target.output.parent.mkdir(parents=True, exist_ok=True)
+                        if target.output_format == "svg":
+                            target.output.write_text(svg, encoding="utf-8")
+                        else:
+                            page.eval_on_selector(
+                                "#diagram", "(element, svg) => { element.innerHTML = svg; }", svg
+                            )
+                            page.locator("#diagram > svg").screenshot(path=str(target.output))
+                        written.add(target.output)
+                except PlaywrightError as exc:
+                    message = str(exc).strip().splitlines()[0] if str(exc).strip() else exc
+                    print(f"   ⚠️  Mermaid no pudo renderizar {source.relative_to(PROJECT_ROOT)}: {message}")
+        finally:
+            browser.close()
+    return written
+
+
+def pdf_fallback_job(job: DiagramJob, source_dir: Path, pdf_fallback_dir: Path) -> DiagramJob | None:
+    """Return the PDF-only PNG sidecar job for Mermaid SVG diagrams, if any.
 
     Kroki's Mermaid SVG can contain `foreignObject` HTML labels. Those are crisp
     in browsers, but some SVG converters drop the text. Kroki's native PNG
@@ -279,42 +522,272 @@ def maybe_render_pdf_fallback_png(
     vector SVG→PDF converter is available.
     """
     if job.output_format != "svg" or job.diagram_type != "mermaid":
-        return
+        return None
 
     relative = job.source.relative_to(source_dir)
-    output = pdf_fallback_dir / relative.with_suffix(".png")
-    if output.exists() and not force:
-        return
-
-    print(f"   🧩 Generando fallback PDF Mermaid PNG: {output.relative_to(PROJECT_ROOT)}")
-    render_job(
-        DiagramJob(
-            source=job.source,
-            output=output,
-            diagram_type=job.diagram_type,
-            output_format="png",
-        ),
-        kroki_url,
-        timeout,
-        retries,
-        request_mode,
-        mermaid_renderer,
+    return DiagramJob(
+        source=job.source,
+        output=pdf_fallback_dir / relative.with_suffix(".png"),
+        diagram_type=job.diagram_type,
+        output_format="png",
     )
 
 
-def write_manifest(jobs: list[DiagramJob], output_dir: Path) -> None:
+def renderer_name(job: DiagramJob, mermaid_label: str) -> str:
+    """Name of the renderer used for `job` (part of the cache key)."""
+    if job.diagram_type == "mermaid":
+        return mermaid_label
+    return "kroki"
+
+
+def diagram_cache_key(job: DiagramJob, renderer: str) -> str:
+    """Content hash of everything that determines the rendered bytes."""
+    digest = hashlib.sha256()
+    header = f"{RENDER_CACHE_VERSION}\0{job.diagram_type}\0{job.output_format}\0{renderer}\0"
+    digest.update(header.encode("utf-8"))
+    digest.update(job.source.read_bytes())
+    return digest.hexdigest()
+
+
+def project_relative(path: Path) -> str:
+    return path.relative_to(PROJECT_ROOT).as_posix()
+
+
+def ensure_output(
+    job: DiagramJob,
+    key: str,
+    recorded: dict[str, str] | None,
+    cache_dir: Path,
+    force: bool,
+    render,
+) -> tuple[str, str]:
+    """Make job.output hold the bytes for `key`. Returns (status, key of the output).
+
+    Status is "current", "restored" or "rendered". `recorded` maps outputs
+    to the hash they were rendered from (None for a manifest written before
+    hashes existed: existing outputs are then trusted, as before). Outputs
+    missing locally are restored from the cache directory when possible;
+    otherwise `render(job)` is called. It returns the key of the renderer
+    that really ran, which may differ from `key` after a fallback, and the
+    result is cached (and recorded) under that key.
+    """
+    cached = cache_dir / f"{key}.{job.output_format}"
+    if not force and job.output.exists():
+        if recorded is None:
+            return "current", key
+        if recorded.get(project_relative(job.output)) == key:
+            if not cached.exists():
+                store_in_cache(job.output, cached)
+            return "current", key
+
+    if not force and cached.is_file():
+        job.output.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(cached, job.output)
+        return "restored", key
+
+    key = render(job)
+    store_in_cache(job.output, cache_dir / f"{key}.{job.output_format}")
+    return "rendered", key
+
+
+def needs_render(
+    job: DiagramJob,
+    key: str,
+    recorded: dict[str, str] | None,
+    cache_dir: Path,
+    force: bool,
+) -> bool:
+    """True when ensure_output would have to call the renderer for `job`."""
+    if force:
+        return True
+    if job.output.exists() and (recorded is None or recorded.get(project_relative(job.output)) == key):
+        return False
+    return not (cache_dir / f"{key}.{job.output_format}").is_file()
+
+
+def mermaid_batch_targets(
+    jobs: list[DiagramJob],
+    args: argparse.Namespace,
+    source_dir: Path,
+    pdf_fallback_dir: Path,
+    recorded: dict[str, str] | None,
+) -> list[DiagramJob]:
+    """Mermaid outputs (including PDF fallback PNGs) that have to be rendered."""
+    cache_dir = args.cache_dir.resolve()
+    targets: list[DiagramJob] = []
+    for job in jobs:
+        if job.diagram_type != "mermaid":
+            continue
+        for target in (job, pdf_fallback_job(job, source_dir, pdf_fallback_dir)):
+            if target is None:
+                continue
+            key = diagram_cache_key(target, args.mermaid_label)
+            if needs_render(target, key, recorded, cache_dir, args.force):
+                targets.append(target)
+    return targets
+
+
+def store_in_cache(output: Path, cached: Path) -> None:
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cached.with_name(f"{cached.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    shutil.copy2(output, tmp_path)
+    os.replace(tmp_path, cached)
+
+
+def process_job(
+    job: DiagramJob,
+    args: argparse.Namespace,
+    source_dir: Path,
+    pdf_fallback_dir: Path,
+    recorded: dict[str, str] | None,
+    client=None,
+    prerendered: frozenset[Path] = frozenset(),
+) -> tuple[str, dict]:
+    """Bring one diagram (plus its PDF fallback) up to date.
+
+    Returns (status, manifest item); status is "rendered" if anything had to
+    be rendered, "restored" if it came from the cache, else "current".
+    """
+    cache_dir = args.cache_dir.resolve()
+
+    def render(target: DiagramJob) -> str:
+        if target.output in prerendered:
+            # Already written by the batch Mermaid renderer.
+            return diagram_cache_key(target, args.mermaid_label)
+        if target.output_format == job.output_format:
+            print(f"🔧 Renderizando {job.source.relative_to(PROJECT_ROOT)}...")
+        else:
+            print(f"   🧩 Generando fallback PDF Mermaid PNG: {target.output.relative_to(PROJECT_ROOT)}")
+        used = render_job(
+            target,
+            args.kroki_url,
+            args.timeout,
+            args.retries,
+            args.request_mode,
+            args.mermaid_renderer,
+            client,
+        )
+        # A browser-mode diagram rendered by mmdc/Kroki is cached as theirs.
+        return diagram_cache_key(target, renderer_name(target, mermaid_renderer_label(used, None)))
+
+    key = diagram_cache_key(job, renderer_name(job, args.mermaid_label))
+    status, key = ensure_output(job, key, recorded, cache_dir, args.force, render)
+    statuses = [status]
+    item = {
+        "source": project_relative(job.source),
+        "output": project_relative(job.output),
+        "type": job.diagram_type,
+        "format": job.output_format,
+        "hash": key,
+    }
+
+    fallback = pdf_fallback_job(job, source_dir, pdf_fallback_dir)
+    if fallback is not None:
+        fallback_key = diagram_cache_key(fallback, renderer_name(fallback, args.mermaid_label))
+        status, fallback_key = ensure_output(fallback, fallback_key, recorded, cache_dir, args.force, render)
+        statuses.append(status)
+        item["pdf_fallback"] = {
+            "output": project_relative(fallback.output),
+            "hash": fallback_key,
+        }
+
+    for status in ("rendered", "restored"):
+        if status in statuses:
+            return status, item
+    return "current", item
+
+
+def render_jobs(
+    jobs: list[DiagramJob],
+    args: argparse.Namespace,
+    source_dir: Path,
+    pdf_fallback_dir: Path,
+    recorded: dict[str, str] | None,
+    client=None,
+    prerendered: frozenset[Path] = frozenset(),
+) -> dict[DiagramJob, tuple[str, dict | None]]:
+    """Render jobs on a bounded thread pool. Returns {job: (status, manifest item)}.
+
+    Rendering is network/subprocess bound, so threads are enough. At most
+    `--workers` jobs are in flight; once `--max-failures` is reached no new
+    job is started and the ones already running are allowed to finish.
+    """
+    workers = max(1, args.workers)
+    statuses: dict[DiagramJob, tuple[str, dict | None]] = {}
+    pending_jobs = iter(jobs)
+    running: dict[Future[tuple[str, dict]], DiagramJob] = {}
+    failed = 0
+    stopped = False
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while not stopped and len(running) < workers:
+                job = next(pending_jobs, None)
+                if job is None:
+                    break
+                future = executor.submit(
+                    process_job,
+                    job,
+                    args,
+                    source_dir,
+                    pdf_fallback_dir,
+                    recorded,
+                    client,
+                    prerendered,
+                )
+                running[future] = job
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                try:
+                    statuses[job] = future.result()
+                except Exception as exc:
+                    statuses[job] = ("failed", None)
+                    failed += 1
+                    print(f"❌ {exc}")
+                    if args.max_failures and failed >= args.max_failures and not stopped:
+                        stopped = True
+                        print(f"🛑 Parando tras {failed} fallos. Usa --max-failures 0 para continuar siempre.")
+    return statuses
+
+
+def load_recorded_hashes(output_dir: Path) -> tuple[dict[str, str] | None, dict[str, dict]]:
+    """Read the previous manifest.
+
+    Returns ({output: hash} or None for a manifest without hashes,
+    {output: item}) with POSIX project-relative output paths.
+    """
+    try:
+        manifest = json.loads((output_dir / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None, {}
+
+    items = {
+        item["output"].replace("\\", "/"): item
+        for item in manifest.get("items", [])
+        if "output" in item
+    }
+    if manifest.get("cache_version") != RENDER_CACHE_VERSION:
+        return None, items
+
+    hashes: dict[str, str] = {}
+    for output, item in items.items():
+        if "hash" in item:
+            hashes[output] = item["hash"]
+        fallback = item.get("pdf_fallback")
+        if fallback:
+            hashes[fallback["output"]] = fallback["hash"]
+    return hashes, items
+
+
+def write_manifest(items: list[dict], output_dir: Path) -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
     manifest = {
         "generated_by": "scripts/render_diagrams.py",
-        "items": [
-            {
-                "source": str(job.source.relative_to(PROJECT_ROOT)),
-                "output": str(job.output.relative_to(PROJECT_ROOT)),
-                "type": job.diagram_type,
-                "format": job.output_format,
-            }
-            for job in jobs
-        ],
+        "cache_version": RENDER_CACHE_VERSION,
+        "items": items,
     }
     (output_dir / "manifest.json").write_text(
         json.dumps(manifest, indent=2, ensure_ascii=False) + "\n",
@@ -335,76 +808,73 @@ def main() -> int:
         print("   Crea archivos como diagram_sources/es/flujo.mermaid para renderizarlos.")
         return 0
 
+    mermaid_js: Path | None = None
+    if any(job.diagram_type == "mermaid" for job in jobs):
+        try:
+            args.mermaid_renderer, mermaid_js = resolve_mermaid_renderer(args)
+        except RuntimeError as exc:
+            print(f"❌ {exc}")
+            return 1
+        print(f"🧜 Renderizador Mermaid: {args.mermaid_renderer}")
+    args.mermaid_label = mermaid_renderer_label(args.mermaid_renderer, mermaid_js)
+
+    recorded, previous_items = load_recorded_hashes(output_dir)
+
     print(f"🖼️  Diagramas encontrados: {len(jobs)}")
     for job in jobs:
-        status = "existe" if job.output.exists() else "nuevo"
+        if not job.output.exists():
+            status = "nuevo"
+        elif recorded is None:
+            status = "existe"
+        else:
+            key = diagram_cache_key(job, renderer_name(job, args.mermaid_label))
+            status = "sin cambios" if recorded.get(project_relative(job.output)) == key else "modificado"
         print(f"   - {job.source.relative_to(PROJECT_ROOT)} -> {job.output.relative_to(PROJECT_ROOT)} ({status})")
 
     if args.dry_run:
         print("✅ Dry-run completado. No se ha contactado con Kroki.")
         return 0
 
-    rendered: list[DiagramJob] = []
-    skipped = 0
-    failed = 0
-    for job in jobs:
-        if job.output.exists() and not args.force:
-            try:
-                maybe_render_pdf_fallback_png(
-                    job,
-                    source_dir,
-                    pdf_fallback_dir,
-                    args.kroki_url,
-                    args.timeout,
-                    args.retries,
-                    args.request_mode,
-                    args.mermaid_renderer,
-                    args.force,
-                )
-            except Exception as exc:
-                failed += 1
-                print(f"❌ {exc}")
-                if args.max_failures and failed >= args.max_failures:
-                    print(f"🛑 Parando tras {failed} fallos. Usa --max-failures 0 para continuar siempre.")
-                    break
-                continue
-            skipped += 1
-            rendered.append(job)
-            continue
+    prerendered: frozenset[Path] = frozenset()
+    if args.mermaid_renderer == "browser" and mermaid_js is not None:
+        targets = mermaid_batch_targets(jobs, args, source_dir, pdf_fallback_dir, recorded)
         try:
-            print(f"🔧 Renderizando {job.source.relative_to(PROJECT_ROOT)}...")
-            render_job(
-                job,
-                args.kroki_url,
-                args.timeout,
-                args.retries,
-                args.request_mode,
-                args.mermaid_renderer,
-            )
-            maybe_render_pdf_fallback_png(
-                job,
-                source_dir,
-                pdf_fallback_dir,
-                args.kroki_url,
-                args.timeout,
-                args.retries,
-                args.request_mode,
-                args.mermaid_renderer,
-                args.force,
-            )
-            rendered.append(job)
-        except Exception as exc:
-            failed += 1
-            print(f"❌ {exc}")
-            if args.max_failures and failed >= args.max_failures:
-                print(f"🛑 Parando tras {failed} fallos. Usa --max-failures 0 para continuar siempre.")
-                break
-
-    write_manifest(rendered, output_dir)
+            prerendered = frozenset(render_mermaid_batch(targets, mermaid_js))
+        except Exception as exc:  # Chromium not installed, browser crash...
+            reason = str(exc).strip().splitlines()[0] if str(exc).strip() else exc
+            print(f"⚠️  No se pudo usar el renderizador Mermaid por lotes: {reason}")
+            print("   Se usará Mermaid CLI o Kroki diagrama a diagrama.")
+            args.mermaid_renderer = "mmdc" if shutil.which("mmdc") or shutil.which("npx") else "kroki"
+            args.mermaid_label = mermaid_renderer_label(args.mermaid_renderer, None)
+
+    client = create_http_client(args.pool_size or args.workers, http2=not args.no_http2)
+    try:
+        statuses = render_jobs(
+            jobs, args, source_dir, pdf_fallback_dir, recorded, client, prerendered
+        )
+    finally:
+        if client is not None:
+            client.close()
+    # Keep discovery order so the manifest does not depend on thread timing.
+    # Jobs never started (after --max-failures) keep their previous entry.
+    items = []
+    for job in jobs:
+        status, item = statuses.get(job, ("pending", None))
+        if status == "pending":
+            item = previous_items.get(project_relative(job.output))
+        if item is not None:
+            items.append(item)
+    write_manifest(items, output_dir)
+
+    counts = {"rendered": 0, "restored": 0, "current": 0, "failed": 0}
+    for status, _item in statuses.values():
+        counts[status] += 1
+    failed = counts["failed"]
 
     print("\nResumen:")
-    print(f"  ✅ Renderizados/registrados: {len(rendered)}")
-    print(f"  ⏭️  Omitidos por existir: {skipped}")
+    print(f"  ✅ Renderizados: {counts['rendered']}")
+    print(f"  ♻️  Restaurados desde caché: {counts['restored']}")
+    print(f"  ⏭️  Sin cambios: {counts['current']}")
     print(f"  ❌ Fallidos: {failed}")
 
     if failed:
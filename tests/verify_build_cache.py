@@ -0,0 +1,109 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from build_cache import manifest_path_for, sync_tree
+
+failures = 0
+
+
+def check(description, condition):
+    global failures
+    if condition:
+        print(f"✅ SUCCESS: {description}")
+    else:
+        failures += 1
+        print(f"❌ FAILURE: {description}")
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def bump_mtime(path):
+    # Some filesystems only keep coarse timestamps: move mtime visibly forward.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+
+def run():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        dst = os.path.join(tmp, "dst")
+        write(os.path.join(src, "intro.md"), "# Intro\n")
+        write(os.path.join(src, "chapter", "page.md"), "# Page\n")
+        write(os.path.join(src, "chapter", "old.md"), "# Old\n")
+
+        # 1. First sync copies everything
+        print("📂 First sync...")
+        check("first sync copies all 3 files", sync_tree(src, dst) == (3, 0))
+        check("manifest written next to dst", os.path.isfile(manifest_path_for(dst)))
+        check("copied content matches", read(os.path.join(dst, "chapter", "page.md")) == "# Page\n")
+
+        # 2. Nothing changed: nothing transferred, timestamps preserved
+        print("🔁 Sync without changes...")
+        page_dst = os.path.join(dst, "chapter", "page.md")
+        mtime_before = os.stat(page_dst).st_mtime_ns
+        check("unchanged tree transfers nothing", sync_tree(src, dst) == (0, 0))
+        check("unchanged file keeps its mtime", os.stat(page_dst).st_mtime_ns == mtime_before)
+
+        # 3. Touched with identical bytes (e.g. git checkout): still not transferred
+        print("👆 Touching a file without changing it...")
+        bump_mtime(os.path.join(src, "chapter", "page.md"))
+        check("touched but identical file is not transferred", sync_tree(src, dst) == (0, 0))
+        check("touched file keeps the old dst mtime", os.stat(page_dst).st_mtime_ns == mtime_before)
+
+        # 4. Changed, deleted and kept files
+        print("✏️ Changing, deleting and keeping files...")
+        write(os.path.join(src, "intro.md"), "# Intro (v2)\n")
+        bump_mtime(os.path.join(src, "intro.md"))
+        os.remove(os.path.join(src, "chapter", "old.md"))
+        write(os.path.join(dst, "python.aux"), "\\relax\n")
+        write(os.path.join(dst, "stale.log"), "stale\n")
+        result = sync_tree(src, dst, keep=lambda rel: rel.endswith(".aux"))
+        check("1 changed file copied, old.md and stale.log removed", result == (1, 2))
+        check("changed content reaches dst", read(os.path.join(dst, "intro.md")) == "# Intro (v2)\n")
+        check("deleted source file is gone from dst", not os.path.exists(os.path.join(dst, "chapter", "old.md")))
+        check("file accepted by keep survives", os.path.isfile(os.path.join(dst, "python.aux")))
+        check("file rejected by keep is removed", not os.path.exists(os.path.join(dst, "stale.log")))
+
+        # 5. Deleting a whole folder removes its now empty directory too
+        os.remove(os.path.join(src, "chapter", "page.md"))
+        os.rmdir(os.path.join(src, "chapter"))
+        result = sync_tree(src, dst, keep=lambda rel: rel.endswith(".aux"))
+        check("removed folder is counted", result == (0, 1))
+        check("empty folder is removed from dst", not os.path.exists(os.path.join(dst, "chapter")))
+
+        # 6. link=True shares the inode instead of copying
+        print("🔗 Sync with hard links...")
+        static_src = os.path.join(tmp, "static_src")
+        static_dst = os.path.join(tmp, "static_dst")
+        write(os.path.join(static_src, "logo.svg"), "<svg/>\n")
+        check("linked sync transfers 1 file", sync_tree(static_src, static_dst, link=True) == (1, 0))
+        logo_src = os.path.join(static_src, "logo.svg")
+        logo_dst = os.path.join(static_dst, "logo.svg")
+        check("linked file shares the source inode", os.path.samefile(logo_src, logo_dst))
+
+        # A new version replaces the link, it must not write through it
+        os.remove(logo_src)
+        write(logo_src, "<svg>v2</svg>\n")
+        check("replaced file is linked again", sync_tree(static_src, static_dst, link=True) == (1, 0))
+        check("new link points to the new inode", os.path.samefile(logo_src, logo_dst))
+        check("linked content is the new version", read(logo_dst) == "<svg>v2</svg>\n")
+
+    if failures:
+        print(f"❌ {failures} check(s) failed.")
+        sys.exit(1)
+    print("✅ All build cache checks passed.")
+
+
+if __name__ == "__main__":
+    run()
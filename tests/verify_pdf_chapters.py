@@ -0,0 +1,69 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from pdf_chapters import split_latex_document
+
+failures = 0
+
+PREAMBLE = "\\documentclass{sphinxmanual}\n\\usepackage{sphinx}\n"
+
+
+def check(description, condition):
+    global failures
+    if condition:
+        print(f"✅ SUCCESS: {description}")
+    else:
+        failures += 1
+        print(f"❌ FAILURE: {description}")
+
+
+def document(body):
+    return PREAMBLE + "\\begin{document}\n" + body + "\\end{document}\n"
+
+
+def run():
+    # 1. A book with parts is split per \part, chapters stay inside their part
+    print("📘 Book with parts...")
+    front = "\\sphinxmaketitle\n\\sphinxtableofcontents\n"
+    root = "\\pagestyle{normal}\n\\sphinxstepscope\n\nRoot page.\n\n"
+    part_one = "\\part{Basics}\n\\chapter{Intro}\nText.\n\\chapter{Types}\nText.\n"
+    part_two = "\\sphinxstepscope\n\\part{Advanced}\n\\chapter{Classes}\nText.\n"
+    text = document(front + root + part_one + part_two)
+    split = split_latex_document(text)
+    check("document with parts is split", split is not None)
+    if split:
+        check("preamble is everything before \\begin{document}", split["preamble"] == PREAMBLE)
+        check("front ends at the table of contents", split["front"] == "\n" + front.rstrip("\n"))
+        check("one piece per part", len(split["pieces"]) == 2)
+        check("root page stays with the first part", split["pieces"][0] == "\n" + root + part_one)
+        check("second piece starts at its \\sphinxstepscope", split["pieces"][1] == part_two)
+        check("pagestyle before the first part is kept", split["pagestyle"] == "normal")
+        check(
+            "pieces put back together give the original document",
+            split["preamble"] + "\\begin{document}" + split["front"] + "".join(split["pieces"])
+            + "\\end{document}\n" == text,
+        )
+
+    # 2. Without parts every \chapter is a piece
+    print("📗 Book with chapters only...")
+    chapters = "\\chapter{One}\nA.\n\\chapter{Two}\nB.\n\\chapter{Three}\nC.\n"
+    split = split_latex_document(document(front + chapters))
+    check("split per chapter when there are no parts", split is not None and len(split["pieces"]) == 3)
+    if split:
+        check("no pagestyle when the source has none", split["pagestyle"] is None)
+
+    # 3. Documents that cannot be split
+    print("📕 Documents that cannot be split...")
+    check("no table of contents", split_latex_document(document(chapters)) is None)
+    check("a single chapter", split_latex_document(document(front + "\\chapter{Only}\nA.\n")) is None)
+    check("no \\begin{document}", split_latex_document(PREAMBLE + front + chapters) is None)
+
+    if failures:
+        print(f"❌ {failures} check(s) failed.")
+        sys.exit(1)
+    print("✅ All PDF chapter checks passed.")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,54 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from preview_book import BOOK_DIR, PROJECT_ROOT, affected_languages, book_languages
+
+failures = 0
+
+
+def check(description, paths, expected):
+    global failures
+    result = affected_languages({BOOK_DIR / path for path in paths})
+    if result == expected:
+        print(f"✅ SUCCESS: {description} -> {result}")
+    else:
+        failures += 1
+        print(f"❌ FAILURE: {description} -> {result} (expected {expected})")
+
+
+def run():
+    languages = sorted(book_languages())
+    print(f"🌍 Languages in book/: {languages}")
+    if len(languages) < 2:
+        print("❌ FAILURE: need at least two _config_<lang>.yml files to check.")
+        sys.exit(1)
+    first, second = languages[:2]
+
+    # Pages and per-language config only rebuild their own language
+    check("page of one language", [f"{first}/intro.md"], {first})
+    check("nested page", [f"{second}/part/chapter/page.md"], {second})
+    check("per-language config", [f"_config_{first}.yml"], {first})
+    check("per-language toc", [f"_toc_{second}.yml"], {second})
+    check("pages of two languages", [f"{first}/intro.md", f"{second}/intro.md"], {first, second})
+
+    # Anything shared rebuilds every language (None)
+    check("shared _static", ["_static/custom.css"], None)
+    check("shared _config.yml", ["_config.yml"], None)
+    check("root-level bib file", ["references.bib"], None)
+    check("page plus shared file", [f"{first}/intro.md", "_static/custom.css"], None)
+    check("unknown language folder", ["xx/intro.md"], None)
+    check("config of an unknown language", ["_config_xx.yml"], None)
+    check("no paths", [], None)
+
+    # BOOK_DIR / <absolute path> is that absolute path
+    check("file outside book/", [PROJECT_ROOT / "scripts" / "build_book.py"], None)
+
+    if failures:
+        print(f"❌ {failures} check(s) failed.")
+        sys.exit(1)
+    print("✅ All preview language checks passed.")
+
+
+if __name__ == "__main__":
+    run()